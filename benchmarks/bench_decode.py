@@ -0,0 +1,96 @@
+"""Compare decode time and peak memory of parsing JSONP metadata responses
+using the previous approach (`response.text` sliced then `json.loads`) with
+the current one (decoding `response.content` in place).
+
+Usage::
+
+    python -m benchmarks.bench_decode [ingredient_count]
+"""
+
+from multiprocessing import Process, Queue
+import json
+import resource
+import sys
+import timeit
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+import yummly
+
+
+def make_metadata(count):
+    """Return JSONP ingredient metadata body with `count` entries."""
+    data = [{'description': u'Ingredient \xe9 {0}'.format(i),
+             'term': u'ingredient \xe9 {0}'.format(i),
+             'searchValue': u'ingredient \xe9 {0}'.format(i)}
+            for i in xrange(count)]
+    return "set_metadata('ingredient', {0});".format(json.dumps(data))
+
+
+def make_response(body):
+    response = Response()
+    response.status_code = 200
+    # Yummly serves JSONP without a charset.
+    response.headers = CaseInsensitiveDict(
+        {'Content-Type': 'application/javascript'})
+    response._content = body
+    return response
+
+
+def previous_extract_metadata(response):
+    text = response.text
+    start = text.index('[')
+    end = text.rfind(']') + 1
+    parsed = text[start:end]
+
+    return json.loads(parsed)
+
+
+def current_extract_metadata(response):
+    return yummly.Client(json_decoder='json')._extract_metadata(response)
+
+
+VARIANTS = [
+    ('metadata previous', previous_extract_metadata),
+    ('metadata current', current_extract_metadata),
+]
+
+
+def maxrss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure_peak(func, body, results):
+    """Record peak memory increase in KiB of calling `func` once."""
+    response = make_response(body)
+    before = maxrss()
+    func(response)
+    results.put(maxrss() - before)
+
+
+def run(count=50000):
+    body = make_metadata(count)
+    print('ingredients: {0}, body: {1:.1f} MiB\n'.format(
+        count, len(body) / 1024.0 / 1024.0))
+    print('{0:<20} {1:>10} {2:>14}'.format('variant', 'ms', 'peak MiB'))
+
+    for name, func in VARIANTS:
+        # `response.text` caches nothing so each call starts from bytes.
+        seconds = min(timeit.repeat(lambda: func(make_response(body)),
+                                    number=1,
+                                    repeat=5))
+
+        # Measure peak memory in a fresh process so runs don't interfere.
+        results = Queue()
+        proc = Process(target=measure_peak, args=(func, body, results))
+        proc.start()
+        peak = results.get()
+        proc.join()
+
+        print('{0:<20} {1:>10.1f} {2:>14.1f}'.format(
+            name, seconds * 1000, peak / 1024.0))
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:]])
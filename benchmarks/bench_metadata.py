@@ -0,0 +1,59 @@
+"""Compare memory use of metadata models built with and without a shared
+value table (``Client(intern_metadata=True)``) for every metadata category.
+
+Each category is expanded to `size` synthetic items from the sample
+metadata, encoded and decoded again so that, as with a real response, every
+item holds its own copy of each value.
+
+Usage::
+
+    python -m benchmarks.bench_metadata
+"""
+
+import json
+
+from yummly import Client
+from yummly.interning import ValueTable
+from benchmarks.bench_models import deep_sizeof
+from tests.fakes import SAMPLE_METADATA
+
+
+def make_items(key, size):
+    """Return `size` decoded metadata items for category `key`."""
+    samples = SAMPLE_METADATA[key]
+    items = []
+
+    for i in xrange(size):
+        item = dict(samples[i % len(samples)])
+
+        # Make per-item values unique like in real metadata.
+        for field in ('id', 'searchValue', 'term', 'name', 'description',
+                      'shortDescription', 'longDescription'):
+            if field in item:
+                item[field] = u'{0} {1}'.format(item[field], i)
+
+        items.append(item)
+
+    return json.loads(json.dumps(items))
+
+
+def run(size=5000):
+    print('{0:<12} {1:>8} {2:>14} {3:>14} {4:>8}'.format(
+        'category', 'items', 'bytes', 'interned', 'saved'))
+
+    for key in sorted(Client.METADATA):
+        MetaClass = Client.METADATA[key]
+        items = make_items(key, size)
+        table = ValueTable()
+
+        plain = deep_sizeof([MetaClass(**md) for md in items])
+        shared = [MetaClass(**table.compact(md)) for md in items]
+        # Count shared values once, including the table holding them.
+        interned = deep_sizeof([shared, table._values])
+
+        print('{0:<12} {1:>8} {2:>14} {3:>14} {4:>7.1f}%'.format(
+            key, size, plain, interned, 100.0 * (plain - interned) / plain))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,116 @@
+"""Compare memory use and construction time of `dict` based models from
+`yummly.models` with `__slots__` based models from `yummly.compact`, and of
+eager with lazy recipe hydration.
+
+Usage::
+
+    python -m benchmarks.bench_models
+"""
+
+import sys
+import timeit
+
+from yummly import compact, models
+from tests.fakes import SAMPLE_RECIPE, make_match
+
+
+def deep_sizeof(obj, seen=None):
+    """Return approximate size in bytes of `obj` and everything it refers
+    to, counting shared objects once.
+    """
+    seen = set() if seen is None else seen
+
+    if id(obj) in seen:
+        return 0
+
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen)
+                    for key, value in obj.iteritems())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+
+    # NOTE: Don't touch `__dict__` of `dict` subclasses since accessing it
+    # allocates it.
+    if isinstance(obj, compact.Record):
+        size += sum(deep_sizeof(value, seen) for _, value in obj.items())
+
+    return size
+
+
+def model_size(obj, data):
+    """Return size of `obj` excluding the values shared with its source
+    `data` (i.e. only the memory added by the model objects themselves).
+    """
+    seen = set()
+    deep_sizeof(data, seen)
+    return deep_sizeof(obj, seen)
+
+
+CASES = [
+    ('SearchMatch', lambda: make_match(1)),
+    ('Recipe', lambda: dict(SAMPLE_RECIPE, yields=SAMPLE_RECIPE['yield'])),
+    ('MetaIngredient', lambda: {'description': 'Apple',
+                                'term': 'apple',
+                                'searchValue': 'apple'}),
+]
+
+
+def run(number=20000):
+    print('{0:<16} {1:>8} {2:>12} {3:>12} {4:>12}'.format(
+        'model', 'module', 'bytes/obj', 'us/obj', 'vs dict'))
+
+    for name, make_data in CASES:
+        data = make_data()
+        baseline = None
+
+        for module in (models, compact):
+            Model = getattr(module, name)
+            size = model_size(Model(**data), data)
+            seconds = min(timeit.repeat(lambda: Model(**data),
+                                        number=number,
+                                        repeat=3))
+            usec = seconds / number * 1e6
+
+            if baseline is None:
+                baseline = size
+
+            print('{0:<16} {1:>8} {2:>12} {3:>12.2f} {4:>11.0f}%'.format(
+                name,
+                module.__name__.split('.')[-1],
+                size,
+                usec,
+                100.0 * size / baseline))
+
+
+def run_lazy(number=20000):
+    """Time building a recipe and reading only its top level fields (as a
+    listing endpoint does) with eager and lazy recipe models.
+    """
+    data = CASES[1][1]()
+
+    def listing(Model):
+        recipe = Model(**data)
+        return recipe.id, recipe.name, recipe.ingredientLines
+
+    print('\n{0:<24} {1:>8} {2:>12}'.format('recipe listing', 'module',
+                                            'us/obj'))
+
+    for module in (models, compact):
+        for name in ('Recipe', 'LazyRecipe'):
+            Model = getattr(module, name)
+            seconds = min(timeit.repeat(lambda: listing(Model),
+                                        number=number,
+                                        repeat=3))
+
+            print('{0:<24} {1:>8} {2:>12.2f}'.format(
+                name,
+                module.__name__.split('.')[-1],
+                seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    run()
+    run_lazy()
@@ -0,0 +1,329 @@
+"""Benchmark suite covering client throughput, response decoding, model
+construction and import time.
+
+Client calls are made over HTTP against a local stub server and offline
+against a fixture recorded from it. Results are written as JSON so that runs
+of different versions can be compared.
+
+Usage::
+
+    python -m benchmarks.suite [--quick] [--output results.json]
+    python -m benchmarks.suite --compare before.json after.json
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from time import time
+import timeit
+
+import yummly
+from yummly import compact, models
+from yummly.client import iter_concurrent
+from yummly.decoders import DECODERS, get_decoder
+from yummly.transport import RecordingAdapter, ReplayAdapter
+from benchmarks.bench_decode import make_metadata, make_response
+from benchmarks.bench_models import model_size
+from tests.fakes import (
+    make_match,
+    SAMPLE_METADATA,
+    SAMPLE_RECIPE,
+    SAMPLE_SEARCH
+)
+from tests.stubserver import StubServer
+
+
+# Number of calls per client benchmark and concurrent workers.
+CALLS = 500
+WORKERS = 10
+
+# Number of objects built per model benchmark.
+MODEL_COUNT = 5000
+
+# Number of ingredients in the metadata response decoded.
+METADATA_COUNT = 5000
+
+
+def model_data():
+    """Return dict of model class names mapped to the data they're built
+    from.
+    """
+    data = {
+        'Recipe': dict(SAMPLE_RECIPE, yields=SAMPLE_RECIPE['yield']),
+        'Flavors': make_match(0)['flavors'],
+        'Attribution': SAMPLE_RECIPE['attribution'],
+        'NutritionEstimate': SAMPLE_RECIPE['nutritionEstimates'][1],
+        'NutritionUnit': SAMPLE_RECIPE['nutritionEstimates'][1]['unit'],
+        'RecipeImages': SAMPLE_RECIPE['images'][0],
+        'RecipeSource': SAMPLE_RECIPE['source'],
+        'RecipeBatch': {'recipes': [], 'errors': {}},
+        'SearchResult': SAMPLE_SEARCH,
+        'MultiSearchResult': {
+            'totalMatchCount': SAMPLE_SEARCH['totalMatchCount'],
+            'facetCounts': SAMPLE_SEARCH['facetCounts'],
+            'matches': [models.SearchMatch(**match)
+                        for match in SAMPLE_SEARCH['matches']],
+            'errors': {},
+            'sources': dict((match['id'], [0])
+                            for match in SAMPLE_SEARCH['matches']),
+        },
+        'SearchMatch': make_match(1),
+        'SearchCriteria': SAMPLE_SEARCH['criteria'],
+        'MetaAttribute': SAMPLE_METADATA['cuisine'][0],
+    }
+    data['LazyRecipe'] = data['Recipe']
+
+    for key, MetaClass in yummly.Client.METADATA.iteritems():
+        data[MetaClass.__name__] = SAMPLE_METADATA[key][0]
+
+    return data
+
+
+def model_classes(module):
+    """Return model classes defined in `module`."""
+    return sorted((name, cls) for name, cls in vars(module).iteritems()
+                  if inspect.isclass(cls) and
+                  cls.__module__ == module.__name__ and
+                  hasattr(cls, 'to_dict' if module is compact else 'items') and
+                  not name.startswith('_') and
+                  name not in ('Storage', 'Record'))
+
+
+def percentile(values, percent):
+    """Return `percent` percentile (nearest rank) of sorted `values`."""
+    index = int(round(percent / 100.0 * len(values) + 0.5)) - 1
+    return values[min(max(index, 0), len(values) - 1)]
+
+
+def throughput(func, calls, workers):
+    """Call `func(index)` `calls` times with up to `workers` calls at once
+    and return requests per second and latency percentiles.
+    """
+    def timed(index):
+        started = time()
+        func(index)
+        return time() - started
+
+    started = time()
+
+    if workers == 1:
+        latencies = [timed(index) for index in xrange(calls)]
+    else:
+        latencies = []
+
+        for _, _, latency, error in iter_concurrent(timed, xrange(calls),
+                                                    workers):
+            if error is not None:
+                raise error
+            latencies.append(latency)
+
+    elapsed = time() - started
+    latencies.sort()
+
+    return {
+        'rps': calls / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def endpoint_calls(client):
+    """Return dict of endpoint names mapped to functions making the
+    `index`-th call to the endpoint.
+    """
+    keys = sorted(yummly.Client.METADATA)
+
+    return {
+        'recipe': lambda index: client.recipe('recipe-{0}'.format(index)),
+        'search': lambda index: client.search('query {0}'.format(index)),
+        'metadata': lambda index: client.metadata(keys[index % len(keys)]),
+    }
+
+
+def bench_client(calls=CALLS, workers=WORKERS):
+    """Measure client throughput over HTTP (``stub``) and from a recorded
+    fixture (``replay``).
+    """
+    results = {}
+    tmpdir = tempfile.mkdtemp()
+    fixture = os.path.join(tmpdir, 'api.jsonl')
+
+    server = StubServer()
+    server.start()
+
+    try:
+        # Record every call once to replay them later.
+        recorder = server.configure(yummly.Client(
+            adapter=RecordingAdapter(fixture)))
+
+        for call in endpoint_calls(recorder).itervalues():
+            for index in xrange(calls):
+                call(index)
+
+        transports = [
+            ('stub', lambda: server.configure(yummly.Client(
+                pool_maxsize=workers, coalesce=False))),
+            ('replay', lambda: server.configure(yummly.Client(
+                adapter=ReplayAdapter(fixture), coalesce=False))),
+        ]
+
+        for transport, make_client in transports:
+            for mode, count in (('sequential', 1), ('concurrent', workers)):
+                client = make_client()
+
+                for endpoint, call in endpoint_calls(client).iteritems():
+                    name = 'client.{0}.{1}.{2}'.format(transport, mode,
+                                                       endpoint)
+                    results[name] = throughput(call, calls, count)
+
+                client.close()
+    finally:
+        server.stop()
+        shutil.rmtree(tmpdir)
+
+    return results
+
+
+def bench_decode(count=METADATA_COUNT):
+    """Measure decode time of JSON and JSONP responses with every installed
+    decoder.
+    """
+    results = {}
+    bodies = [
+        ('recipe', json.dumps(SAMPLE_RECIPE), '_extract_response'),
+        ('search', json.dumps(SAMPLE_SEARCH), '_extract_response'),
+        ('metadata', make_metadata(count), '_extract_metadata'),
+    ]
+
+    for name in sorted(DECODERS):
+        try:
+            decoder = get_decoder(name)
+        except ImportError:
+            continue
+
+        client = yummly.Client(json_decoder=decoder)
+
+        for endpoint, body, method in bodies:
+            response = make_response(body)
+            extract = getattr(client, method)
+            number = max(1, 2000000 // len(body))
+            seconds = min(timeit.repeat(lambda: extract(response),
+                                        number=number,
+                                        repeat=3)) / number
+
+            results['decode.{0}.{1}'.format(name, endpoint)] = {
+                'us': seconds * 1e6,
+                'mb_per_s': len(body) / seconds / 1e6,
+            }
+
+    return results
+
+
+def bench_models(number=MODEL_COUNT):
+    """Measure construction time and memory of every model class."""
+    results = {}
+    data = model_data()
+
+    for module in (models, compact):
+        for name, Model in model_classes(module):
+            kargs = data[name]
+            seconds = min(timeit.repeat(lambda: Model(**kargs),
+                                        number=number,
+                                        repeat=3)) / number
+
+            results['model.{0}.{1}'.format(module.__name__.split('.')[-1],
+                                           name)] = {
+                'us': seconds * 1e6,
+                'bytes': model_size(Model(**kargs), kargs),
+            }
+
+    return results
+
+
+def bench_import(repeat=5):
+    """Measure time to import `yummly` in a fresh interpreter."""
+    code = ('from time import time; started = time(); import yummly; '
+            'print(time() - started)')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    seconds = min(float(subprocess.check_output([sys.executable, '-c', code],
+                                                cwd=root))
+                  for _ in xrange(repeat))
+
+    return {'import': {'ms': seconds * 1000}}
+
+
+def run(quick=False):
+    """Run all benchmarks and return results."""
+    scale = 10 if quick else 1
+    results = {}
+
+    results.update(bench_client(calls=CALLS // scale))
+    results.update(bench_decode(count=METADATA_COUNT // scale))
+    results.update(bench_models(number=MODEL_COUNT // scale))
+    results.update(bench_import())
+
+    return {
+        'meta': {
+            'yummly': yummly.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time(),
+            'quick': quick,
+        },
+        'results': results,
+    }
+
+
+def compare(before, after):
+    """Print change of every metric of `after` results relative to
+    `before`.
+    """
+    print('{0:<40} {1:>10} {2:>12} {3:>12} {4:>8}'.format(
+        'benchmark', 'metric', 'before', 'after', 'change'))
+
+    for name in sorted(after['results']):
+        for metric, value in sorted(after['results'][name].iteritems()):
+            base = before['results'].get(name, {}).get(metric)
+
+            if base:
+                change = '{0:+.1f}%'.format(100.0 * (value - base) / base)
+            else:
+                change = 'new'
+
+            print('{0:<40} {1:>10} {2:>12} {3:>12.3f} {4:>8}'.format(
+                name, metric,
+                '-' if base is None else '{0:.3f}'.format(base),
+                value, change))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--quick', action='store_true',
+                        help='run fewer iterations')
+    parser.add_argument('--output', help='write results to file')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'),
+                        help='compare two results files')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as before, open(args.compare[1]) as after:
+            compare(json.load(before), json.load(after))
+        return
+
+    results = json.dumps(run(quick=args.quick), indent=2, sort_keys=True)
+
+    if args.output:
+        with open(args.output, 'w') as fileobj:
+            fileobj.write(results + '\n')
+    else:
+        print(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -53,7 +53,7 @@ setup(
     author_email=meta['__email__'],
     description=meta['__summary__'],
     long_description=read('README.rst'),
-    packages=find_packages(exclude=['tests']),
+    packages=find_packages(exclude=['tests', 'benchmarks']),
     install_requires=meta['__install_requires__'],
     tests_require=['tox'],
     cmdclass={'test': Tox},
@@ -0,0 +1,293 @@
+"""Offline fakes for exercising `yummly.Client` without hitting the API.
+"""
+
+import json
+from threading import Lock
+from time import sleep
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import urlparse
+from urlparse import parse_qs
+
+
+SAMPLE_RECIPE = {
+    'id': 'Hot-Turkey-Salad-Sandwiches-Allrecipes',
+    'name': 'Hot Turkey Salad Sandwiches',
+    'rating': 4,
+    'totalTime': '30 min',
+    'totalTimeInSeconds': 1800,
+    'ingredientLines': [
+        '2 cups diced cooked turkey',
+        '2 celery ribs, diced',
+        '1 small onion, diced',
+        '2 hard-cooked eggs, chopped',
+        '3/4 cup mayonnaise',
+    ],
+    'numberOfServings': 6,
+    'yield': '6 sandwiches',
+    'attributes': {'course': ['Main Dishes']},
+    'source': {
+        'sourceRecipeUrl': 'http://allrecipes.com/recipe/hot-turkey-salad/',
+        'sourceSiteUrl': 'http://www.allrecipes.com',
+        'sourceDisplayName': 'AllRecipes',
+    },
+    'attribution': {
+        'html': '<a href="http://www.yummly.com/recipe/">recipe</a>',
+        'url': 'http://www.yummly.com/recipe/',
+        'text': 'Recipe search powered by Yummly',
+        'logo': 'http://static.yummly.com/api-logo.png',
+    },
+    'flavors': {
+        'Salty': 0.67,
+        'Meaty': 0.83,
+        'Piquant': 0.0,
+        'Bitter': 0.17,
+        'Sour': 0.17,
+        'Sweet': 0.17,
+    },
+    'nutritionEstimates': [
+        {
+            'attribute': 'FAT_KCAL',
+            'description': None,
+            'value': 370.0,
+            'unit': {
+                'id': 'fea252f8-9888-4365-b005-e2c63ed3a776',
+                'abbreviation': 'kcal',
+                'plural': 'calories',
+                'pluralAbbreviation': 'kcal',
+            },
+        },
+        {
+            'attribute': 'FAT',
+            'description': 'Total lipid (fat)',
+            'value': 41.47,
+            'unit': {
+                'id': '12485d0f-3bad-4c17-9b35-7cfcbd6bd66e',
+                'abbreviation': 'g',
+                'plural': 'grams',
+                'pluralAbbreviation': 'grams',
+            },
+        },
+    ],
+    'images': [
+        {
+            'hostedLargeUrl': 'http://i.yummly.com/Hot-Turkey-1.l.png',
+            'hostedSmallUrl': 'http://i.yummly.com/Hot-Turkey-1.s.png',
+        },
+    ],
+}
+
+
+def make_match(index, **overrides):
+    """Return search match data for `index`."""
+    match = {
+        'id': 'Chicken-Casserole-{0}'.format(index),
+        'recipeName': 'Chicken Casserole {0}'.format(index),
+        'rating': index % 5,
+        'totalTimeInSeconds': 600 * (index % 7 + 1),
+        'ingredients': ['chicken', 'cream of mushroom soup', 'rice'],
+        'flavors': {
+            'salty': 0.5,
+            'meaty': 0.8,
+            'piquant': 0.0,
+            'bitter': 0.1,
+            'sour': 0.1,
+            'sweet': 0.2,
+        },
+        'smallImageUrls': [
+            'http://i.yummly.com/Chicken-Casserole-{0}.s.png'.format(index)
+        ],
+        'sourceDisplayName': 'Food Network',
+        'attributes': {'course': ['Main Dishes']},
+    }
+    match.update(overrides)
+    return match
+
+
+def make_search(q='chicken casserole', total=100, start=0, count=10):
+    """Return search response data for a page of matches."""
+    stop = min(start + count, total)
+    return {
+        'totalMatchCount': total,
+        'criteria': {
+            'maxResults': count,
+            'resultsToSkip': start,
+            'terms': q.split(),
+            'requirePictures': False,
+            'facetFields': None,
+            'allowedIngredients': None,
+            'excludedIngredients': None,
+            'attributeRanges': {},
+            'allowedAttributes': [],
+            'excludedAttributes': [],
+            'allowedDiets': [],
+            'nutritionRestrictions': {},
+        },
+        'facetCounts': {},
+        'matches': [make_match(i) for i in xrange(start, stop)],
+        'attribution': {
+            'html': '<a href="http://www.yummly.com/recipes/">recipes</a>',
+            'url': 'http://www.yummly.com/recipes/',
+            'text': 'Recipe search powered by Yummly',
+            'logo': 'http://static.yummly.com/api-logo.png',
+        },
+    }
+
+
+SAMPLE_SEARCH = make_search(total=5, count=5)
+
+
+SAMPLE_METADATA = {
+    'ingredient': [
+        {'description': 'Apple', 'term': 'apple',
+         'searchValue': 'apple'},
+        {'description': 'Apple cider vinegar', 'term': 'apple cider vinegar',
+         'searchValue': 'apple cider vinegar'},
+        {'description': 'Bacon', 'term': 'bacon',
+         'searchValue': 'bacon'},
+        {'description': 'Chicken breast', 'term': 'chicken breast',
+         'searchValue': 'chicken breast'},
+        {'description': 'Chicken', 'term': 'chicken',
+         'searchValue': 'chicken'},
+        {'description': 'Salt', 'term': 'salt',
+         'searchValue': 'salt'},
+    ],
+    'diet': [
+        {'id': '388', 'shortDescription': 'Lacto vegetarian',
+         'longDescription': 'Lacto vegetarian', 'searchValue': '388^Lacto',
+         'type': 'diet', 'localesAvailableIn': ['en-US']},
+        {'id': '386', 'shortDescription': 'Vegan',
+         'longDescription': 'Vegan', 'searchValue': '386^Vegan',
+         'type': 'diet', 'localesAvailableIn': ['en-US']},
+    ],
+    'allergy': [
+        {'id': '393', 'shortDescription': 'Gluten-Free',
+         'longDescription': 'Gluten-Free',
+         'searchValue': '393^Gluten-Free', 'type': 'allergy',
+         'localesAvailableIn': ['en-US']},
+    ],
+    'source': [
+        {'faviconUrl': 'http://www.allrecipes.com/favicon.ico',
+         'description': 'AllRecipes', 'searchValue': 'AllRecipes'},
+    ],
+    'brand': [
+        {'faviconUrl': 'http://www.kraft.com/favicon.ico',
+         'description': 'Kraft', 'searchValue': 'Kraft'},
+    ],
+}
+
+for _key in ('holiday', 'technique', 'cuisine', 'course'):
+    SAMPLE_METADATA[_key] = [
+        {'id': '{0}-{1}'.format(_key, name.lower()),
+         'name': name,
+         'description': name,
+         'searchValue': '{0}^{0}-{1}'.format(_key, name.lower()),
+         'type': _key,
+         'localesAvailableIn': ['en-US', 'en-GB']}
+        for name in ('Italian', 'Mexican', 'Thai')
+    ]
+
+
+def jsonp_metadata(key, data=None):
+    """Return metadata `key` wrapped as a Yummly JSONP response body."""
+    if data is None:
+        data = SAMPLE_METADATA[key]
+    return "set_metadata('{0}', {1});".format(key, json.dumps(data))
+
+
+def default_route(request):
+    """Route a request to the sample response for its endpoint."""
+    path = urlparse(request.url).path
+
+    if path.startswith('/v1/api/recipe/'):
+        recipe_id = path.rsplit('/', 1)[1]
+        return 200, json.dumps(dict(SAMPLE_RECIPE, id=recipe_id))
+    elif path == '/v1/api/recipes':
+        return 200, json.dumps(SAMPLE_SEARCH)
+    elif path.startswith('/v1/api/metadata/'):
+        return 200, jsonp_metadata(path.rsplit('/', 1)[1])
+    else:
+        return 404, ''
+
+
+def paged_search_route(total):
+    """Return a route serving `total` search matches paged by the request's
+    `start` and `maxResult` params.
+    """
+    def route(request):
+        url = urlparse(request.url)
+
+        if url.path != '/v1/api/recipes':
+            return default_route(request)
+
+        params = parse_qs(url.query)
+        start = int(params.get('start', [0])[0])
+        count = int(params.get('maxResult', [40])[0])
+        q = params.get('q', [''])[0]
+
+        return 200, json.dumps(make_search(q, total, start, count))
+
+    return route
+
+
+class FakeAdapter(BaseAdapter):
+    """Transport adapter which serves canned responses.
+
+    :param route: Callable taking a prepared request and returning either
+        a ``(status, body)`` or ``(status, body, headers)`` tuple or raising
+        an exception.
+    :param latency: Seconds to sleep before responding
+    """
+    def __init__(self, route=default_route, latency=0):
+        super(FakeAdapter, self).__init__()
+        self.route = route
+        self.latency = latency
+        self.requests = []
+        self._lock = Lock()
+
+    def send(self, request, **kargs):
+        with self._lock:
+            self.requests.append(request)
+
+        if self.latency:
+            sleep(self.latency)
+
+        result = self.route(request)
+        status, body = result[:2]
+        headers = {'Content-Type': 'application/json'}
+
+        if len(result) > 2:
+            headers.update(result[2])
+
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response._content_consumed = True
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+
+        return response
+
+    def close(self):
+        pass
+
+
+class Clock(object):
+    """Manually advanced timer which sleeping advances instead of blocking.
+    Slept durations are recorded in `sleeps`.
+    """
+
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
@@ -0,0 +1,87 @@
+"""Local HTTP server standing in for the Yummly API in stress tests.
+"""
+
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+from threading import Thread
+
+from requests.models import PreparedRequest
+
+from .fakes import default_route
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler answering with the server's route."""
+
+    protocol_version = 'HTTP/1.1'
+
+    # Send each response in one write without delay.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        request = PreparedRequest()
+        request.prepare(method='GET',
+                        url=self.server.url + self.path,
+                        headers=dict(self.headers))
+
+        result = self.server.route(request)
+        status, body = result[:2]
+        headers = {'Content-Type': 'application/json'}
+
+        if len(result) > 2:
+            headers.update(result[2])
+
+        self.send_response(status)
+
+        for name, value in headers.iteritems():
+            self.send_header(name, value)
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    """Threaded HTTP server on a free local port serving responses from
+    `route`, which takes the same arguments and returns the same results as
+    the routes of `fakes.FakeAdapter`.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, route=default_route):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StubHandler)
+        self.route = route
+        self.url = 'http://127.0.0.1:{0}'.format(self.server_port)
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._thread = Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    def configure(self, client):
+        """Point `client` at this server."""
+        client.URL_BASE = self.url + '/v1/api'
+        client.URL_GET = client.URL_BASE + '/recipe/'
+        client.URL_SEARCH = client.URL_BASE + '/recipes'
+        client.URL_META = client.URL_BASE + '/metadata'
+
+        return client
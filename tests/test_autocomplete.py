@@ -0,0 +1,79 @@
+"""Test cases for ingredient autocomplete index.
+"""
+
+from StringIO import StringIO
+import unittest
+
+import yummly
+from yummly import models
+from yummly.autocomplete import IngredientIndex
+from .fakes import FakeAdapter, SAMPLE_METADATA
+
+
+def terms(items):
+    return [item.term for item in items]
+
+
+class TestIngredientIndex(unittest.TestCase):
+    """Test cases for prefix and fuzzy ingredient lookups."""
+
+    def setUp(self):
+        self.index = IngredientIndex(
+            [models.MetaIngredient(**md)
+             for md in SAMPLE_METADATA['ingredient']])
+
+    def test_prefix(self):
+        self.assertEqual(terms(self.index.prefix('app')),
+                         ['apple', 'apple cider vinegar'])
+        self.assertEqual(terms(self.index.prefix('Chick', k=1)),
+                         ['chicken'])
+        self.assertEqual(terms(self.index.prefix('zzz')), [])
+
+    def test_prefix_word_start(self):
+        self.assertEqual(terms(self.index.prefix('vine')),
+                         ['apple cider vinegar'])
+        self.assertEqual(terms(self.index.prefix('c')),
+                         ['chicken', 'chicken breast', 'apple cider vinegar'])
+
+    def test_fuzzy(self):
+        self.assertEqual(terms(self.index.fuzzy('bacn', k=1)), ['bacon'])
+        self.assertEqual(terms(self.index.fuzzy('chiken brest', k=1)),
+                         ['chicken breast'])
+        self.assertEqual(self.index.fuzzy('qqqq'), [])
+
+    def test_suggest(self):
+        self.assertEqual(terms(self.index.suggest('sal', k=1)), ['salt'])
+        self.assertEqual(terms(self.index.suggest('aple', k=2)),
+                         ['apple', 'apple cider vinegar'])
+
+    def test_dump_load(self):
+        fileobj = StringIO()
+        self.index.dump(fileobj)
+        fileobj.seek(0)
+
+        loaded = IngredientIndex.load(fileobj)
+
+        self.assertEqual(len(loaded), len(self.index))
+        self.assertIsInstance(loaded.items[0], models.MetaIngredient)
+        for query in ('app', 'c', 'vine', 'bacn'):
+            self.assertEqual(loaded.suggest(query), self.index.suggest(query))
+
+    def test_from_client(self):
+        client = yummly.Client(adapter=FakeAdapter())
+        index = IngredientIndex.from_client(client)
+
+        self.assertEqual(len(index), len(SAMPLE_METADATA['ingredient']))
+
+    def test_compact_dump_load(self):
+        client = yummly.Client(adapter=FakeAdapter(), compact=True)
+        index = IngredientIndex.from_client(client)
+
+        fileobj = StringIO()
+        index.dump(fileobj)
+        fileobj.seek(0)
+
+        loaded = IngredientIndex.load(fileobj)
+
+        self.assertIsInstance(loaded.items[0], yummly.compact.MetaIngredient)
+        self.assertEqual(loaded.items, index.items)
+        self.assertEqual(loaded.suggest('app'), index.suggest('app'))
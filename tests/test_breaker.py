@@ -0,0 +1,109 @@
+"""Test cases for circuit breaker.
+"""
+
+import unittest
+
+from requests.exceptions import ConnectionError
+
+import yummly
+from yummly.breaker import CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+from .fakes import Clock, FakeAdapter, default_route
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for circuit breaker states."""
+
+    def setUp(self):
+        self.clock = Clock()
+        self.breaker = CircuitBreaker(threshold=0.5,
+                                      window=4,
+                                      min_calls=4,
+                                      reset_timeout=10,
+                                      timer=self.clock)
+
+    def test_opens_at_threshold(self):
+        for success in (True, False, True):
+            self.breaker.record(success)
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+        self.breaker.record(False)
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_window(self):
+        for success in (False, True, True, True, True, False):
+            self.breaker.record(success)
+
+        self.assertEqual(self.breaker.failure_rate(), 0.25)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open(self):
+        for _ in xrange(4):
+            self.breaker.record(False)
+
+        self.clock.now = 10
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        # Only one trial request.
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.clock.now = 20
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record(True)
+
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.failure_rate(), 0)
+
+
+class TestClientCircuitBreaker(unittest.TestCase):
+    """Test cases for client circuit breaking."""
+
+    def test_fail_fast(self):
+        clock = Clock()
+        outcomes = [(503, ''), ConnectionError(), (503, ''), (200, '{}')]
+
+        def route(request):
+            outcome = outcomes.pop(0) if outcomes else (200, '{}')
+
+            if isinstance(outcome, Exception):
+                raise outcome
+
+            return outcome
+
+        adapter = FakeAdapter(route=route)
+        breaker = CircuitBreaker(window=4, min_calls=2, timer=clock)
+        client = yummly.Client(adapter=adapter, circuit_breaker=breaker)
+
+        self.assertRaises(Exception, client.recipe, 'a')
+        self.assertRaises(Exception, client.recipe, 'a')
+        self.assertEqual(breaker.state, OPEN)
+
+        self.assertRaises(yummly.YummlyError, client.recipe, 'a')
+        self.assertEqual(len(adapter.requests), 2)
+
+        # Trial request fails and reopens circuit.
+        clock.now = breaker.reset_timeout
+        self.assertRaises(Exception, client.recipe, 'a')
+        self.assertEqual(breaker.state, OPEN)
+
+        clock.now *= 2
+        adapter.route = default_route
+        self.assertEqual(client.recipe('a').id, 'a')
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_client_errors_not_failures(self):
+        breaker = CircuitBreaker(min_calls=1)
+        client = yummly.Client(
+            adapter=FakeAdapter(route=lambda request: (404, '')),
+            circuit_breaker=breaker)
+
+        for _ in xrange(3):
+            self.assertRaises(Exception, client.recipe, 'a')
+
+        self.assertEqual(breaker.state, CLOSED)
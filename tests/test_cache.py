@@ -0,0 +1,326 @@
+"""Test cases for response caching.
+"""
+
+from multiprocessing import Process
+import os
+import shutil
+import tempfile
+from threading import Thread
+import unittest
+
+import yummly
+from yummly.cache import MemoryCache, SQLiteCache
+from .fakes import Clock, FakeAdapter, default_route
+
+
+def fill_cache(path, prefix, count):
+    """Write `count` entries to SQLite cache at `path`."""
+    cache = SQLiteCache(path)
+    for i in xrange(count):
+        cache.set('{0}-{1}'.format(prefix, i), {'value': i})
+
+
+def fill_shared_cache(cache, prefix, count):
+    """Write `count` entries to SQLite cache `cache` created by the parent
+    process and exit with an error if its connection was reused.
+    """
+    if cache._connection() is cache._inherited[0]:
+        os._exit(1)
+    for i in xrange(count):
+        cache.set('{0}-{1}'.format(prefix, i), {'value': i})
+
+
+class TestMemoryCache(unittest.TestCase):
+    """Test cases for in-memory LRU/TTL cache."""
+
+    def test_get_set(self):
+        cache = MemoryCache()
+        cache.set('a', 1)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.stats(),
+                         {'hits': 1, 'misses': 1, 'evictions': 0})
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_ttl_expiry(self):
+        clock = Clock()
+        cache = MemoryCache(timer=clock)
+        cache.set('a', 1, ttl=10)
+        cache.set('b', 2)
+
+        clock.now = 9
+        self.assertEqual(cache.get('a'), 1)
+
+        clock.now = 10
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_delete_clear(self):
+        cache = MemoryCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        cache.delete('a')
+        self.assertEqual(cache.get('a'), None)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class TestSQLiteCache(unittest.TestCase):
+    """Test cases for SQLite disk cache."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_get_set(self):
+        cache = SQLiteCache(self.path)
+        cache.set('a', {'name': u'Cr\xe8me br\xfbl\xe9e', 'list': [1, 2]})
+
+        self.assertEqual(cache.get('a'),
+                         {'name': u'Cr\xe8me br\xfbl\xe9e', 'list': [1, 2]})
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.stats(),
+                         {'hits': 1, 'misses': 1, 'evictions': 0})
+
+    def test_threaded_stats(self):
+        cache = SQLiteCache(self.path)
+        cache.set('a', 1)
+
+        def lookup():
+            for _ in xrange(50):
+                cache.get('a')
+                cache.get('b')
+
+        threads = [Thread(target=lookup) for _ in xrange(8)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(cache.stats(),
+                         {'hits': 400, 'misses': 400, 'evictions': 0})
+
+    def test_persistent(self):
+        SQLiteCache(self.path).set('a', [1])
+
+        self.assertEqual(SQLiteCache(self.path).get('a'), [1])
+
+    def test_ttl_expiry(self):
+        clock = Clock()
+        cache = SQLiteCache(self.path, timer=clock)
+        cache.set('a', 1, ttl=10)
+
+        clock.now = 10
+        self.assertEqual(cache.get('a'), None)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_size_eviction(self):
+        clock = Clock()
+        cache = SQLiteCache(self.path,
+                            max_bytes=100,
+                            timer=clock,
+                            access_interval=0)
+
+        for i in xrange(10):
+            clock.now = i
+            cache.set(str(i), i)
+
+        clock.now = 10
+        cache.get('0')
+        clock.now = 11
+        cache.set('big', ['x' * 10] * 5)
+
+        self.assertEqual(cache.get('0'), 0)
+        self.assertEqual(cache.get('1'), None)
+        self.assertEqual(cache.get('big'), ['x' * 10] * 5)
+        self.assertTrue(cache.evictions > 0)
+
+    def test_access_interval(self):
+        clock = Clock()
+        cache = SQLiteCache(self.path, timer=clock, access_interval=60)
+        cache.set('a', 1)
+
+        def accessed():
+            return cache._connection().execute(
+                'SELECT accessed FROM cache').fetchone()[0]
+
+        clock.now = 30
+        cache.get('a')
+        self.assertEqual(accessed(), 0)
+
+        clock.now = 60
+        cache.get('a')
+        self.assertEqual(accessed(), 60)
+
+    def test_size_total(self):
+        cache = SQLiteCache(self.path)
+        cache.set('a', [1] * 100)
+        cache.set('b', 'b')
+        cache.set('a', 'a')
+        cache.delete('b')
+
+        self.assertEqual(cache.size(), cache._connection().execute(
+            'SELECT SUM(size) FROM cache').fetchone()[0])
+        self.assertEqual(SQLiteCache(self.path).size(), cache.size())
+
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+
+    def test_fork(self):
+        cache = SQLiteCache(self.path)
+        cache.set('parent', 1)
+        conn = cache._connection()
+
+        procs = [Process(target=fill_shared_cache, args=(cache, n, 20))
+                 for n in xrange(4)]
+
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+
+        self.assertEqual([proc.exitcode for proc in procs], [0] * 4)
+        self.assertTrue(cache._connection() is conn)
+        self.assertEqual(len(cache), 81)
+        self.assertEqual(cache.get('2-19'), {'value': 19})
+
+    def test_multiprocess(self):
+        SQLiteCache(self.path)
+        procs = [Process(target=fill_cache, args=(self.path, n, 50))
+                 for n in xrange(4)]
+
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+
+        cache = SQLiteCache(self.path)
+
+        self.assertEqual(len(cache), 200)
+        self.assertEqual(cache.get('3-49'), {'value': 49})
+        self.assertEqual(cache.size(), cache._connection().execute(
+            'SELECT SUM(size) FROM cache').fetchone()[0])
+
+
+class TestClientCache(unittest.TestCase):
+    """Test cases for client response caching."""
+
+    def setUp(self):
+        self.adapter = FakeAdapter()
+        self.cache = MemoryCache()
+        self.client = yummly.Client(adapter=self.adapter, cache=self.cache)
+
+    def test_recipe(self):
+        first = self.client.recipe('a')
+        second = self.client.recipe('a')
+
+        self.assertEqual(first, second)
+        self.assertFalse(first is second)
+        self.assertEqual(len(self.adapter.requests), 1)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_models_not_shared(self):
+        lines = list(self.client.recipe('a').ingredientLines)
+
+        self.client.recipe('a').ingredientLines.append('extra')
+        self.client.recipe('a').ingredientLines.append('extra')
+        self.client.search('chicken').matches[0].ingredients.append('extra')
+
+        self.assertEqual(self.client.recipe('a').ingredientLines, lines)
+        self.assertNotIn('extra',
+                         self.client.search('chicken').matches[0].ingredients)
+        self.assertEqual(self.cache.hits, 4)
+
+    def test_search_params_canonicalised(self):
+        self.client.search('chicken', maxResult=5, **{
+            'allowedIngredient[]': ['salt', 'pepper'],
+            'requirePictures': True,
+        })
+        self.client.search(**{
+            'requirePictures': True,
+            'allowedIngredient[]': ['salt', 'pepper'],
+            'maxResult': 5,
+            'q': 'chicken',
+        })
+        self.client.search('chicken', maxResult=10)
+
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_search_unicode_query(self):
+        self.client.search(u'caf\xe9')
+        self.client.search(u'caf\xe8')
+        self.client.search(u'caf\xe9')
+
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_search_unicode_list_params(self):
+        for ingredient in (u'jalape\xf1o', u'jalape\xf3o', u'jalape\xf1o'):
+            self.client.search(u'chili',
+                               **{'allowedIngredient[]': [ingredient]})
+
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_metadata(self):
+        self.client.metadata('diet')
+        data = self.client.metadata('diet')
+
+        self.assertIsInstance(data[0], yummly.models.MetaDiet)
+        self.assertEqual(len(self.adapter.requests), 1)
+
+    def test_ttl_disabled(self):
+        client = yummly.Client(adapter=self.adapter,
+                               cache=self.cache,
+                               cache_ttl={'recipe': 0})
+        client.recipe('a')
+        client.recipe('a')
+
+        self.assertEqual(len(self.adapter.requests), 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_errors_not_cached(self):
+        client = yummly.Client(
+            adapter=FakeAdapter(route=lambda request: (409, '')),
+            cache=self.cache)
+
+        self.assertRaises(yummly.YummlyError, client.recipe, 'a')
+        self.assertEqual(len(self.cache), 0)
+
+    def test_warm(self):
+        adapter = FakeAdapter(
+            route=lambda request: ((404, '') if request.url.endswith('bad')
+                                   else default_route(request)))
+        client = yummly.Client(adapter=adapter, cache=self.cache)
+        errors = client.warm(['a', 'b', 'bad'])
+
+        self.assertEqual(list(errors), ['bad'])
+        self.assertEqual(len(self.cache), 2)
+
+        client.recipe('a')
+        self.assertEqual(len(adapter.requests), 3)
+
+    def test_warm_without_cache(self):
+        client = yummly.Client(adapter=self.adapter)
+
+        self.assertRaises(yummly.YummlyError, client.warm, ['a'])
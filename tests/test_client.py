@@ -0,0 +1,557 @@
+"""Offline test cases for `yummly.Client` using a fake transport adapter.
+"""
+
+import json
+from threading import Lock
+from time import sleep, time
+import unittest
+
+import requests
+
+import yummly
+from yummly import models
+from .fakes import (
+    FakeAdapter,
+    default_route,
+    paged_search_route,
+    SAMPLE_RECIPE
+)
+
+
+class TestClientSession(unittest.TestCase):
+    """Test cases for client session and connection pooling."""
+
+    def setUp(self):
+        self.adapter = FakeAdapter()
+        self.client = yummly.Client(api_id='id',
+                                    api_key='key',
+                                    adapter=self.adapter)
+
+    def test_session_reused(self):
+        session = self.client.session
+
+        self.client.recipe('a')
+        self.client.recipe('b')
+
+        self.assertTrue(self.client.session is session)
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_auth_headers(self):
+        self.client.recipe('a')
+        headers = self.adapter.requests[0].headers
+
+        self.assertEqual(headers['X-Yummly-App-ID'], 'id')
+        self.assertEqual(headers['X-Yummly-App-Key'], 'key')
+        self.assertNotEqual(headers.get('Connection'), 'close')
+
+    def test_keep_alive_disabled(self):
+        client = yummly.Client(adapter=self.adapter, keep_alive=False)
+        client.recipe('a')
+
+        self.assertEqual(self.adapter.requests[0].headers['Connection'],
+                         'close')
+
+    def test_pool_options(self):
+        client = yummly.Client(pool_connections=3,
+                               pool_maxsize=7,
+                               max_retries=2)
+        adapter = client.session.get_adapter(client.URL_BASE)
+
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertEqual(adapter.max_retries.total, 2)
+
+    def test_shared_session(self):
+        session = requests.Session()
+        session.mount('http://', self.adapter)
+
+        first = yummly.Client(session=session)
+        second = yummly.Client(session=session)
+
+        first.recipe('a')
+        second.recipe('b')
+
+        self.assertTrue(first.session is second.session)
+        self.assertEqual(len(self.adapter.requests), 2)
+
+
+class TestAsyncClient(unittest.TestCase):
+    """Test cases for thread pool backed async client."""
+
+    def test_results(self):
+        with yummly.AsyncClient(adapter=FakeAdapter()) as client:
+            recipe = client.recipe('a')
+            search = client.search('chicken', maxResult=5)
+            metadata = client.metadata('diet')
+
+            self.assertIsInstance(recipe.get(), models.Recipe)
+            self.assertEqual(recipe.get().id, 'a')
+            self.assertIsInstance(search.get(), models.SearchResult)
+            self.assertIsInstance(metadata.get()[0], models.MetaDiet)
+
+    def test_errors(self):
+        adapter = FakeAdapter(route=lambda request: (409, ''))
+
+        with yummly.AsyncClient(adapter=adapter) as client:
+            self.assertRaises(yummly.YummlyError, client.recipe('a').get)
+
+    def test_bounded_concurrency(self):
+        state = {'active': 0, 'peak': 0}
+        lock = Lock()
+
+        def route(request):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            sleep(0.02)
+            with lock:
+                state['active'] -= 1
+            return default_route(request)
+
+        with yummly.AsyncClient(adapter=FakeAdapter(route=route),
+                                max_workers=3) as client:
+            results = [client.recipe(str(i)) for i in xrange(12)]
+            ids = [result.get().id for result in results]
+
+        self.assertEqual(ids, [str(i) for i in xrange(12)])
+        self.assertEqual(state['peak'], 3)
+
+
+class TestBulkRecipes(unittest.TestCase):
+    """Test cases for bulk recipe fetching."""
+
+    def route(self, request):
+        recipe_id = request.url.rsplit('/', 1)[1]
+
+        if recipe_id.startswith('missing'):
+            return 404, ''
+        elif recipe_id.startswith('slow'):
+            sleep(0.05)
+
+        return default_route(request)
+
+    def setUp(self):
+        self.client = yummly.Client(adapter=FakeAdapter(route=self.route))
+
+    def test_recipes_input_order(self):
+        ids = ['slow-{0}'.format(i) if i % 3 == 0 else str(i)
+               for i in xrange(20)]
+        batch = self.client.recipes(ids, max_workers=5)
+
+        self.assertEqual([recipe.id for recipe in batch.recipes], ids)
+        self.assertEqual(batch.errors, {})
+
+    def test_recipes_collect_errors(self):
+        ids = ['a', 'missing-b', 'c', 'missing-d']
+        batch = self.client.recipes(ids, max_workers=2)
+
+        self.assertEqual(batch.recipes[0].id, 'a')
+        self.assertEqual(batch.recipes[1], None)
+        self.assertEqual(batch.recipes[2].id, 'c')
+        self.assertEqual(batch.recipes[3], None)
+        self.assertEqual(set(batch.errors), set(['missing-b', 'missing-d']))
+        self.assertIsInstance(batch.errors['missing-b'],
+                              requests.HTTPError)
+
+    def test_iter_recipes_completion_order(self):
+        ids = ['slow-a', 'b', 'c']
+        results = list(self.client.iter_recipes(ids, max_workers=3))
+
+        self.assertEqual(set(recipe_id for recipe_id, _, _ in results[:2]),
+                         set(['b', 'c']))
+        self.assertEqual(results[-1][0], 'slow-a')
+        self.assertEqual(results[-1][1].name, SAMPLE_RECIPE['name'])
+        self.assertEqual(results[-1][2], None)
+
+
+class TestIterSearch(unittest.TestCase):
+    """Test cases for paginated search iteration."""
+
+    def setUp(self):
+        self.adapter = FakeAdapter(route=paged_search_route(25))
+        self.client = yummly.Client(adapter=self.adapter)
+
+    def test_all_pages(self):
+        matches = list(self.client.iter_search('chicken', page_size=10))
+
+        self.assertEqual([match.id for match in matches],
+                         ['Chicken-Casserole-{0}'.format(i)
+                          for i in xrange(25)])
+        self.assertEqual(len(self.adapter.requests), 3)
+
+    def test_limit(self):
+        matches = list(self.client.iter_search('chicken',
+                                               page_size=10,
+                                               limit=15))
+
+        self.assertEqual(len(matches), 15)
+        self.assertEqual(len(self.adapter.requests), 2)
+        self.assertIn('maxResult=5', self.adapter.requests[1].url)
+
+    def test_prefetch(self):
+        matches = self.client.iter_search('chicken', page_size=5, prefetch=1)
+        next(matches)
+        sleep(0.1)
+
+        # First page is being consumed, one page is buffered and one more is
+        # waiting to be buffered.
+        self.assertEqual(len(self.adapter.requests), 3)
+
+        matches.close()
+        sleep(0.2)
+
+        self.assertEqual(len(self.adapter.requests), 3)
+
+    def test_errors(self):
+        client = yummly.Client(
+            adapter=FakeAdapter(route=lambda request: (409, '')))
+        matches = client.iter_search('chicken')
+
+        self.assertRaises(yummly.YummlyError, next, matches)
+
+
+class TestHydrate(unittest.TestCase):
+    """Test cases for hydrating search matches into recipes."""
+
+    def setUp(self):
+        search = paged_search_route(25)
+
+        def route(request):
+            if request.url.split('?')[0].endswith('-13'):
+                return 404, ''
+            return search(request)
+
+        self.adapter = FakeAdapter(route=route)
+        self.client = yummly.Client(adapter=self.adapter)
+
+    def recipe_requests(self):
+        return [request for request in self.adapter.requests
+                if '/recipe/' in request.url]
+
+    def test_iter_search_recipes(self):
+        results = list(self.client.iter_search_recipes('chicken',
+                                                       page_size=10,
+                                                       max_workers=4))
+
+        self.assertEqual(len(results), 25)
+
+        for match, recipe, error in results:
+            if match.id == 'Chicken-Casserole-13':
+                self.assertEqual(recipe, None)
+                self.assertIsInstance(error, requests.HTTPError)
+            else:
+                self.assertEqual(recipe.id, match.id)
+                self.assertEqual(error, None)
+
+    def test_pages(self):
+        pages = [self.client.search('chicken', 10, start)
+                 for start in (0, 10)]
+        results = list(self.client.hydrate(pages))
+
+        self.assertEqual(sorted(match.id for match, _, _ in results),
+                         sorted(match.id for page in pages
+                                for match in page.matches))
+
+    def test_backpressure(self):
+        results = self.client.iter_search_recipes('chicken',
+                                                  page_size=5,
+                                                  max_workers=3)
+        next(results)
+        sleep(0.1)
+
+        # Recipes in flight or buffered never exceed max workers and at most
+        # one page is prefetched ahead of the matches being hydrated.
+        self.assertEqual(len(self.recipe_requests()), 3)
+        self.assertTrue(len(self.adapter.requests) - 3 <= 3)
+
+        results.close()
+        sleep(0.2)
+        count = len(self.adapter.requests)
+        sleep(0.1)
+
+        self.assertEqual(len(self.adapter.requests), count)
+
+    def test_search_errors(self):
+        client = yummly.Client(
+            adapter=FakeAdapter(route=lambda request: (409, '')))
+        results = client.iter_search_recipes('chicken')
+
+        self.assertRaises(yummly.YummlyError, next, results)
+
+
+class TestMultiSearch(unittest.TestCase):
+    """Test cases for concurrent searches with merged results."""
+
+    def route(self, request):
+        if 'q=broken' in request.url:
+            return 500, ''
+
+        status, body = paged_search_route(50)(request)
+        data = json.loads(body)
+
+        if data['matches']:
+            data['facetCounts'] = {'ingredient': {'salt': 2}}
+
+        return status, json.dumps(data)
+
+    def setUp(self):
+        self.client = yummly.Client(adapter=FakeAdapter(route=self.route))
+        self.queries = [
+            {'q': 'chicken', 'maxResult': 10},
+            {'q': 'casserole', 'maxResult': 10, 'start': 5},
+        ]
+
+    def test_merge(self):
+        result = self.client.multi_search(self.queries, max_workers=2)
+
+        self.assertIsInstance(result, models.MultiSearchResult)
+        self.assertEqual([match.id for match in result.matches],
+                         ['Chicken-Casserole-{0}'.format(i)
+                          for i in xrange(15)])
+        self.assertEqual(result.totalMatchCount, 100)
+        self.assertEqual(result.facetCounts, {'ingredient': {'salt': 4}})
+        self.assertEqual(result.sources['Chicken-Casserole-0'], [0])
+        self.assertEqual(result.sources['Chicken-Casserole-7'], [0, 1])
+        self.assertEqual(result.errors, {})
+
+    def test_rank(self):
+        ratings = self.client.multi_search(self.queries, rank='rating')
+        times = self.client.multi_search(self.queries,
+                                         rank='totalTimeInSeconds')
+
+        self.assertEqual([match.rating for match in ratings.matches[:3]],
+                         [4, 4, 4])
+        self.assertEqual([match.id for match in ratings.matches[:3]],
+                         ['Chicken-Casserole-4', 'Chicken-Casserole-9',
+                          'Chicken-Casserole-14'])
+        self.assertEqual(times.matches[0].totalTimeInSeconds, 600)
+
+        result = self.client.multi_search(self.queries,
+                                          rank=lambda match: match.recipeName)
+        names = [match.recipeName for match in result.matches]
+        self.assertEqual(names, sorted(names))
+
+        self.assertRaises(yummly.YummlyError, self.client.multi_search,
+                          self.queries, rank='popularity')
+
+    def test_errors(self):
+        result = self.client.multi_search(['broken', 'chicken'], raw=True)
+
+        self.assertEqual(list(result.errors), [0])
+        self.assertIsInstance(result.errors[0], requests.HTTPError)
+        self.assertEqual(len(result.matches), 40)
+        self.assertEqual(result.totalMatchCount, 50)
+        self.assertIsInstance(result.matches[0], dict)
+        self.assertNotIsInstance(result.matches[0], models.SearchMatch)
+
+
+class TestRawResponses(unittest.TestCase):
+    """Test cases for returning decoded response data without models."""
+
+    def setUp(self):
+        self.adapter = FakeAdapter(route=paged_search_route(25))
+
+    def test_client_raw(self):
+        client = yummly.Client(adapter=self.adapter, raw=True)
+
+        recipe = client.recipe('a')
+        self.assertEqual(type(recipe), dict)
+        self.assertEqual(recipe['flavors']['Salty'], 0.67)
+
+        search = client.search('chicken', maxResult=5)
+        self.assertEqual(type(search), dict)
+        self.assertEqual(type(search['matches'][0]), dict)
+
+        metadata = client.metadata('diet')
+        self.assertEqual(type(metadata), list)
+        self.assertEqual(type(metadata[0]), dict)
+
+    def test_per_call_raw(self):
+        client = yummly.Client(adapter=self.adapter)
+
+        self.assertEqual(type(client.recipe('a', raw=True)), dict)
+        self.assertEqual(type(client.search('chicken', raw=True)), dict)
+        self.assertEqual(type(client.metadata('diet', raw=True)[0]), dict)
+        self.assertIsInstance(client.recipe('a'), models.Recipe)
+
+        raw_client = yummly.Client(adapter=self.adapter, raw=True)
+        self.assertIsInstance(raw_client.recipe('a', raw=False),
+                              models.Recipe)
+
+    def test_iter_search_raw(self):
+        client = yummly.Client(adapter=self.adapter, raw=True)
+        matches = list(client.iter_search('chicken', page_size=10))
+
+        self.assertEqual(len(matches), 25)
+        self.assertEqual(type(matches[0]), dict)
+
+    def test_async_raw(self):
+        with yummly.AsyncClient(adapter=self.adapter) as client:
+            self.assertEqual(type(client.recipe('a', raw=True).get()), dict)
+            self.assertEqual(type(client.search('chicken', raw=True).get()),
+                             dict)
+            self.assertEqual(type(client.metadata('diet', raw=True).get()),
+                             list)
+
+
+class TestHedging(unittest.TestCase):
+    """Test cases for hedged requests."""
+
+    def slow_first_route(self, delay):
+        """Return route which answers its first request after `delay`."""
+        count = [0]
+        lock = Lock()
+
+        def route(request):
+            with lock:
+                count[0] += 1
+                first = count[0] == 1
+
+            if first:
+                sleep(delay)
+
+            return default_route(request)
+
+        return route
+
+    def make_client(self, route, **kargs):
+        self.adapter = FakeAdapter(route=route)
+        client = yummly.Client(adapter=self.adapter, hedge=True, **kargs)
+
+        for _ in xrange(20):
+            client.latencies['recipe'].record(0.01)
+
+        return client
+
+    def test_hedged(self):
+        client = self.make_client(self.slow_first_route(1.0))
+        started = time()
+        recipe = client.recipe('a')
+
+        self.assertEqual(recipe.id, 'a')
+        self.assertTrue(time() - started < 0.5)
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_fast_response_not_hedged(self):
+        client = self.make_client(default_route, hedge_percentile=50)
+        client.latencies['recipe'].clear()
+
+        for _ in xrange(20):
+            client.latencies['recipe'].record(1.0)
+
+        client.recipe('a')
+
+        self.assertEqual(len(self.adapter.requests), 1)
+
+    def test_hedge_error(self):
+        def route(request):
+            sleep(0.05)
+            raise requests.exceptions.ConnectionError()
+
+        client = self.make_client(route)
+
+        self.assertRaises(requests.exceptions.ConnectionError,
+                          client.recipe, 'a')
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_hedge_server_error(self):
+        def route(request):
+            # Original request is slow but succeeds, the hedge fails fast.
+            if len(self.adapter.requests) > 1:
+                return 503, ''
+            sleep(0.2)
+            return default_route(request)
+
+        client = self.make_client(route)
+        recipe = client.recipe('a')
+
+        self.assertEqual(recipe.id, 'a')
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_hedge_all_server_errors(self):
+        client = self.make_client(lambda request: (sleep(0.05), 503, '')[1:])
+
+        self.assertRaises(requests.HTTPError, client.recipe, 'a')
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_not_enough_samples(self):
+        client = yummly.Client(adapter=FakeAdapter(), hedge=True)
+        client.recipe('a')
+
+        self.assertEqual(len(client.latencies['recipe']), 1)
+
+
+class TestAdaptiveTimeout(unittest.TestCase):
+    """Test cases for adaptive per-endpoint timeouts."""
+
+    def setUp(self):
+        self.timeouts = []
+        self.adapter = FakeAdapter()
+        send = self.adapter.send
+
+        def send_recording_timeout(request, **kargs):
+            self.timeouts.append(kargs.get('timeout'))
+            return send(request, **kargs)
+
+        self.adapter.send = send_recording_timeout
+        self.client = yummly.Client(adapter=self.adapter,
+                                    timeout=5.0,
+                                    adaptive_timeout=True,
+                                    timeout_percentile=90,
+                                    timeout_margin=0.1,
+                                    min_timeout=0.25)
+
+    def test_per_endpoint(self):
+        for _ in xrange(20):
+            self.client.latencies['recipe'].record(0.2)
+            self.client.latencies['metadata'].record(3.0)
+
+        self.client.recipe('a')
+        self.client.metadata('diet')
+        # Not enough search latencies recorded.
+        self.client.search('chicken')
+
+        self.assertAlmostEqual(self.timeouts[0], 0.3)
+        self.assertAlmostEqual(self.timeouts[1], 3.1)
+        self.assertEqual(self.timeouts[2], 5.0)
+
+    def test_limits(self):
+        for _ in xrange(20):
+            self.client.latencies['recipe'].record(0.01)
+            self.client.latencies['search'].record(10.0)
+
+        self.client.recipe('a')
+        self.client.search('chicken')
+
+        self.assertEqual(self.timeouts, [0.25, 5.0])
+
+    def test_latency_recorded(self):
+        self.client.recipe('a')
+        self.client.search('chicken')
+        list(self.client.iter_metadata('diet'))
+
+        self.assertEqual(len(self.client.latencies['recipe']), 1)
+        self.assertEqual(len(self.client.latencies['search']), 1)
+        # Streamed requests aren't timed.
+        self.assertEqual(len(self.client.latencies['metadata']), 0)
+
+    def test_timeout_recorded(self):
+        def route(request):
+            raise requests.exceptions.ReadTimeout()
+
+        self.adapter.route = route
+        self.client.latencies['recipe'].min_samples = 1
+
+        self.assertRaises(requests.exceptions.Timeout,
+                          self.client.recipe, 'a')
+        self.assertEqual(self.client.latencies['recipe'].percentile(100), 5.0)
+
+    def test_disabled(self):
+        client = yummly.Client(adapter=self.adapter, timeout=2.0)
+
+        for _ in xrange(20):
+            client.latencies['recipe'].record(0.1)
+
+        client.recipe('a')
+
+        self.assertEqual(self.timeouts, [2.0])
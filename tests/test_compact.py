@@ -0,0 +1,93 @@
+"""Test cases for compact models.
+"""
+
+import json
+import pickle
+import unittest
+
+import yummly
+from yummly import compact, models
+from .fakes import FakeAdapter, SAMPLE_METADATA, SAMPLE_RECIPE, SAMPLE_SEARCH
+
+
+class TestCompactModels(unittest.TestCase):
+    """Test cases for compact models mirroring dict based models."""
+
+    def assertSameModel(self, record, storage):
+        self.assertEqual(type(record).__name__, type(storage).__name__)
+        self.assertEqual(record.to_dict(),
+                         json.loads(json.dumps(storage)))
+
+    def test_recipe(self):
+        data = dict(SAMPLE_RECIPE, yields=SAMPLE_RECIPE['yield'])
+        recipe = compact.Recipe(**data)
+
+        self.assertSameModel(recipe, models.Recipe(**data))
+        self.assertEqual(recipe.flavors.salty, 0.67)
+        self.assertEqual(recipe.nutritionEstimates[1].unit.abbreviation, 'g')
+        self.assertEqual(recipe['name'], SAMPLE_RECIPE['name'])
+
+    def test_search(self):
+        result = compact.SearchResult(**SAMPLE_SEARCH)
+
+        self.assertSameModel(result, models.SearchResult(**SAMPLE_SEARCH))
+        self.assertIsInstance(result.matches[0], compact.SearchMatch)
+        self.assertIsInstance(result.matches[0].flavors, compact.Flavors)
+
+    def test_metadata(self):
+        for key, MetaClass in yummly.Client.METADATA.items():
+            RecordClass = getattr(compact, MetaClass.__name__)
+
+            for md in SAMPLE_METADATA[key]:
+                self.assertSameModel(RecordClass(**md), MetaClass(**md))
+
+    def test_pickle(self):
+        result = compact.SearchResult(**SAMPLE_SEARCH)
+
+        for protocol in (0, pickle.HIGHEST_PROTOCOL):
+            self.assertEqual(pickle.loads(pickle.dumps(result, protocol)),
+                             result)
+
+    def test_item_access_fields_only(self):
+        match = compact.SearchMatch(**SAMPLE_SEARCH['matches'][0])
+
+        for key in ('keys', 'to_dict', '_slots', '__class__'):
+            self.assertRaises(KeyError, lambda: match[key])
+            self.assertEqual(match.get(key, 'default'), 'default')
+            self.assertFalse(key in match)
+
+    def test_delete(self):
+        recipe = compact.Recipe(**SAMPLE_RECIPE)
+        del recipe.images
+
+        self.assertFalse('images' in recipe)
+        self.assertRaises(KeyError, lambda: recipe['images'])
+        self.assertEqual(recipe.get('images'), None)
+        self.assertFalse('images' in recipe.to_dict())
+
+    def test_unhashable(self):
+        match = compact.SearchMatch(**SAMPLE_SEARCH['matches'][0])
+
+        self.assertRaises(TypeError, hash, match)
+
+    def test_no_dict(self):
+        match = compact.SearchMatch(**SAMPLE_SEARCH['matches'][0])
+
+        self.assertFalse(hasattr(match, '__dict__'))
+        self.assertRaises(AttributeError, setattr, match, 'extra', 1)
+
+
+class TestClientCompact(unittest.TestCase):
+    """Test cases for client returning compact models."""
+
+    def setUp(self):
+        self.client = yummly.Client(adapter=FakeAdapter(), compact=True)
+
+    def test_models(self):
+        self.assertIsInstance(self.client.recipe('a'), compact.Recipe)
+        self.assertIsInstance(self.client.search('chicken'),
+                              compact.SearchResult)
+        self.assertIsInstance(self.client.metadata('cuisine')[0],
+                              compact.MetaCuisine)
+        self.assertEqual(self.client.recipe('a').yields,
+                         SAMPLE_RECIPE['yield'])
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""Test cases for JSON decoders and response extraction.
+"""
+
+import json
+import unittest
+
+from requests.exceptions import ChunkedEncodingError
+
+import yummly
+from yummly.decoders import get_decoder, iter_array, JSONDecoder
+from .fakes import FakeAdapter, jsonp_metadata, SAMPLE_METADATA
+
+
+class TestDecoders(unittest.TestCase):
+    """Test cases for pluggable JSON decoders."""
+
+    def test_get_decoder(self):
+        self.assertIsInstance(get_decoder('json'), JSONDecoder)
+        self.assertIsInstance(get_decoder(), JSONDecoder)
+        self.assertRaises(KeyError, get_decoder, 'invalid')
+
+    def test_loads_slice(self):
+        data = 'prefix([{"a": "\xc3\xa9"}]);'
+        start = data.index('[')
+        end = data.rindex(']') + 1
+
+        self.assertEqual(get_decoder('json').loads_slice(data, start, end),
+                         [{'a': u'\xe9'}])
+
+    def test_floats_match_json(self):
+        try:
+            decoder = get_decoder('ujson')
+        except ImportError:
+            self.skipTest('ujson not installed')
+
+        data = '{"rating": 4.35, "meaty": 0.8333333333333334, "value": 0.1}'
+
+        self.assertEqual(decoder.loads(data), json.loads(data))
+        self.assertEqual(decoder.loads_slice(data, 0, len(data)),
+                         json.loads(data))
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in xrange(0, len(data), size)]
+
+
+class TestIterArray(unittest.TestCase):
+    """Test cases for incremental JSON array parsing."""
+
+    def test_chunk_sizes(self):
+        data = [{'a': u'\xe9\u20ac', 'b': [1, 2.5, None]}, 12345, 'x', True,
+                [], {}]
+        body = 'set_metadata(\'x\', {0});'.format(json.dumps(data))
+
+        for size in (1, 2, 3, 7, 64, len(body)):
+            self.assertEqual(list(iter_array(chunked(body, size))), data)
+
+    def test_split_numbers(self):
+        for chunks, expected in ((['[1.', '5, 2]'], [1.5, 2]),
+                                 (['[100000.', '0, 2]'], [100000.0, 2]),
+                                 (['[1e', '3]'], [1000.0]),
+                                 (['[-2.5E', '-1 ,3]'], [-0.25, 3]),
+                                 (['[12', '34', ']'], [1234]),
+                                 (['[tr', 'ue, nu', 'll]'], [True, None])):
+            self.assertEqual(list(iter_array(chunks)), expected)
+
+    def test_split_numbers_all_chunkings(self):
+        body = '[1.5, -20.25e1, 3E-2, 400, 0.0]'
+        expected = json.loads(body)
+
+        for i in range(len(body)):
+            for j in range(i, len(body)):
+                chunks = [body[:i], body[i:j], body[j:]]
+                self.assertEqual(list(iter_array(chunks)), expected)
+
+    def test_empty(self):
+        self.assertEqual(list(iter_array(['f([', ' ]);'])), [])
+
+    def test_malformed(self):
+        self.assertRaises(ValueError, list, iter_array(['no array']))
+        self.assertRaises(ValueError, list, iter_array(['[{"a": 1}, {']))
+        self.assertRaises(ValueError, list, iter_array(['[{"a" 1}]']))
+        self.assertRaises(ValueError, list, iter_array(['[1.', '5']))
+        self.assertRaises(ValueError, list, iter_array(['[1x]']))
+
+    def test_lazy(self):
+        def chunks():
+            yield '[1, 2'
+            yield ', 3'
+            raise AssertionError('read too far')
+
+        items = iter_array(chunks())
+
+        self.assertEqual(next(items), 1)
+
+
+class TestClientDecoding(unittest.TestCase):
+    """Test cases for client response decoding."""
+
+    def test_metadata_jsonp(self):
+        data = [{'description': u'Cr\xe8me fra\xeeche',
+                 'term': u'cr\xe8me fra\xeeche',
+                 'searchValue': u'cr\xe8me fra\xeeche'}]
+        body = jsonp_metadata('ingredient', data)
+        adapter = FakeAdapter(route=lambda request: (200, body))
+        client = yummly.Client(adapter=adapter, json_decoder='json')
+
+        self.assertEqual(client.metadata('ingredient'), data)
+
+    def test_metadata_malformed(self):
+        for body in ("set_metadata('diet', [{]);", 'oops'):
+            adapter = FakeAdapter(route=lambda request: (200, body))
+            client = yummly.Client(adapter=adapter)
+
+            self.assertRaises(yummly.YummlyError, client.metadata, 'diet')
+
+    def test_custom_decoder(self):
+        calls = []
+
+        class Decoder(JSONDecoder):
+            def loads(self, data):
+                calls.append(data)
+                return json.loads(data)
+
+        client = yummly.Client(adapter=FakeAdapter(), json_decoder=Decoder())
+        client.recipe('a')
+        client.metadata('diet')
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(client.metadata('diet', raw=True),
+                         SAMPLE_METADATA['diet'])
+
+    def test_iter_metadata(self):
+        client = yummly.Client(adapter=FakeAdapter())
+
+        for key in client.METADATA:
+            self.assertEqual(list(client.iter_metadata(key, chunk_size=16)),
+                             client.metadata(key))
+
+        items = list(client.iter_metadata('diet', raw=True))
+        self.assertEqual(items, SAMPLE_METADATA['diet'])
+
+    def test_iter_metadata_errors(self):
+        adapter = FakeAdapter(route=lambda request: (200, '[{"a": 1}]'))
+        client = yummly.Client(adapter=adapter)
+
+        self.assertRaises(yummly.YummlyError, list,
+                          client.iter_metadata('diet'))
+        self.assertRaises(yummly.YummlyError, list,
+                          client.iter_metadata('invalid'))
+
+    def test_iter_metadata_stream_errors(self):
+        class BrokenStream(object):
+            def read(self, size):
+                raise ChunkedEncodingError('Connection broken')
+
+            def close(self):
+                pass
+
+        class BrokenAdapter(FakeAdapter):
+            def send(self, request, **kargs):
+                response = super(BrokenAdapter, self).send(request, **kargs)
+                response._content = False
+                response._content_consumed = False
+                response.raw = BrokenStream()
+                return response
+
+        client = yummly.Client(adapter=BrokenAdapter())
+
+        self.assertRaises(ChunkedEncodingError, list,
+                          client.iter_metadata('diet'))
@@ -0,0 +1,80 @@
+"""Test cases for shared metadata values.
+"""
+
+import unittest
+
+import yummly
+from yummly.interning import ValueTable
+from yummly.registry import MetadataRegistry
+from .fakes import FakeAdapter, SAMPLE_METADATA
+
+
+class TestValueTable(unittest.TestCase):
+    """Test cases for shared value table."""
+
+    def test_share(self):
+        table = ValueTable()
+        first = table.share([u'en-US', u'en-GB'])
+        second = table.share([u'en-US', u'en-GB'])
+
+        self.assertEqual(first, (u'en-US', u'en-GB'))
+        self.assertTrue(first is second)
+        self.assertTrue(table.share(u''.join([u'en-', u'US'])) is first[0])
+
+    def test_compact(self):
+        table = ValueTable()
+        data = SAMPLE_METADATA['diet'][0]
+        compacted = table.compact(data)
+
+        self.assertEqual(compacted['localesAvailableIn'], ('en-US',))
+        self.assertEqual(compacted['id'], data['id'])
+        self.assertEqual(data['localesAvailableIn'], ['en-US'])
+
+    def test_fields(self):
+        table = ValueTable(fields=['type'])
+        compacted = table.compact(SAMPLE_METADATA['diet'][0])
+
+        self.assertEqual(compacted['localesAvailableIn'], ['en-US'])
+        self.assertEqual(len(table), 1)
+
+        table.clear()
+        self.assertEqual(len(table), 0)
+
+
+class TestClientInterning(unittest.TestCase):
+    """Test cases for client metadata interning."""
+
+    def setUp(self):
+        self.client = yummly.Client(adapter=FakeAdapter(),
+                                    intern_metadata=True)
+
+    def test_metadata(self):
+        first, second = self.client.metadata('diet')
+
+        self.assertEqual(first.localesAvailableIn, ('en-US',))
+        self.assertTrue(first.localesAvailableIn is
+                        second.localesAvailableIn)
+        self.assertTrue(first.type is second.type)
+
+    def test_shared_between_calls(self):
+        cuisine = self.client.metadata('cuisine')[0]
+        streamed = list(self.client.iter_metadata('cuisine'))[0]
+        registry = MetadataRegistry(self.client)
+
+        self.assertTrue(cuisine.localesAvailableIn is
+                        streamed.localesAvailableIn)
+        self.assertTrue(cuisine.localesAvailableIn is
+                        registry.all('holiday')[0].localesAvailableIn)
+
+    def test_raw_unchanged(self):
+        data = self.client.metadata('diet', raw=True)
+
+        self.assertEqual(data, SAMPLE_METADATA['diet'])
+
+    def test_disabled(self):
+        client = yummly.Client(adapter=FakeAdapter())
+        first, second = client.metadata('diet')
+
+        self.assertEqual(first.localesAvailableIn, ['en-US'])
+        self.assertFalse(first.localesAvailableIn is
+                         second.localesAvailableIn)
@@ -0,0 +1,42 @@
+"""Test cases for latency tracking.
+"""
+
+import unittest
+
+from yummly.latency import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test cases for rolling latency distribution."""
+
+    def test_percentiles(self):
+        latencies = LatencyHistogram(min_samples=1)
+
+        for ms in xrange(100, 0, -1):
+            latencies.record(ms / 1000.0)
+
+        self.assertEqual(latencies.percentile(50), 0.05)
+        self.assertEqual(latencies.percentile(95), 0.095)
+        self.assertEqual(latencies.percentile(100), 0.1)
+        self.assertEqual(latencies.percentile(0), 0.001)
+
+    def test_window(self):
+        latencies = LatencyHistogram(size=3, min_samples=1)
+
+        for seconds in (5, 1, 2, 3):
+            latencies.record(seconds)
+
+        self.assertEqual(len(latencies), 3)
+        self.assertEqual(latencies.percentile(100), 3)
+
+    def test_min_samples(self):
+        latencies = LatencyHistogram(min_samples=2)
+        latencies.record(1)
+
+        self.assertEqual(latencies.percentile(50), None)
+
+        latencies.record(2)
+        self.assertEqual(latencies.percentile(50), 1)
+
+        latencies.clear()
+        self.assertEqual(latencies.percentile(50), None)
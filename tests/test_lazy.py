@@ -0,0 +1,166 @@
+"""Test cases for lazily hydrated recipe models.
+"""
+
+import copy
+import json
+import pickle
+import unittest
+
+import yummly
+from yummly import compact, models
+from .fakes import FakeAdapter, SAMPLE_RECIPE
+
+
+DATA = dict(SAMPLE_RECIPE, yields=SAMPLE_RECIPE['yield'])
+
+
+class TestLazyRecipe(unittest.TestCase):
+    """Test cases for dict based lazy recipe."""
+
+    def setUp(self):
+        self.eager = models.Recipe(**DATA)
+        self.lazy = models.LazyRecipe(**DATA)
+
+    def test_not_hydrated(self):
+        self.assertEqual(self.lazy.id, DATA['id'])
+        self.assertEqual(self.lazy.ingredientLines, DATA['ingredientLines'])
+        self.assertFalse(dict.__contains__(self.lazy, 'flavors'))
+
+    def test_attribute_access(self):
+        for key in self.eager:
+            self.assertEqual(getattr(self.lazy, key), getattr(self.eager, key))
+
+        self.assertEqual(self.lazy.flavors.salty, 0.67)
+        self.assertIsInstance(self.lazy.nutritionEstimates[0].unit,
+                              models.NutritionUnit)
+
+    def test_item_access(self):
+        self.assertEqual(self.lazy['source'], self.eager['source'])
+        self.assertEqual(self.lazy.get('images'), self.eager.get('images'))
+        self.assertTrue('attribution' in self.lazy)
+        self.assertRaises(AttributeError, getattr, self.lazy, 'missing')
+        self.assertRaises(KeyError, lambda: self.lazy['missing'])
+
+    def test_equality(self):
+        self.assertEqual(self.lazy, self.eager)
+        self.assertEqual(models.LazyRecipe(**DATA), self.eager)
+        self.assertEqual(self.eager, models.LazyRecipe(**DATA))
+
+    def test_len_not_hydrated(self):
+        self.assertEqual(len(self.lazy), len(self.eager))
+        self.assertTrue(self.lazy)
+        self.assertFalse(dict.__contains__(self.lazy, 'flavors'))
+
+        self.lazy.flavors
+        self.assertEqual(len(self.lazy), len(self.eager))
+
+    def test_dict_protocol(self):
+        self.assertEqual(len(self.lazy), len(self.eager))
+        self.assertEqual(sorted(models.LazyRecipe(**DATA)),
+                         sorted(self.eager))
+        self.assertEqual(sorted(models.LazyRecipe(**DATA).items()),
+                         sorted(self.eager.items()))
+        self.assertEqual(models.LazyRecipe(**DATA).copy(), self.eager)
+
+    def test_delete(self):
+        del self.lazy['flavors']
+        del self.eager['flavors']
+        self.lazy.pop('images')
+        self.eager.pop('images')
+        del self.lazy.source
+        del self.eager.source
+
+        for key in ('flavors', 'images', 'source'):
+            self.assertFalse(key in self.lazy)
+            self.assertEqual(self.lazy.get(key), None)
+            self.assertRaises(KeyError, lambda: self.lazy[key])
+            self.assertRaises(AttributeError, getattr, self.lazy, key)
+
+        self.assertEqual(len(self.lazy), len(self.eager))
+        self.assertEqual(self.lazy, self.eager)
+        self.assertRaises(KeyError, self.lazy.__delitem__, 'flavors')
+
+    def test_set_before_built(self):
+        self.lazy.flavors = None
+        self.eager.flavors = None
+
+        self.assertEqual(self.lazy.flavors, None)
+        self.assertEqual(self.lazy, self.eager)
+
+    def test_unpacking(self):
+        def fields(**kargs):
+            return kargs
+
+        # Unpacking bypasses lazy lookups; `copy` includes all fields.
+        self.assertEqual(fields(**self.lazy.copy()), fields(**self.eager))
+        self.assertEqual(models.Recipe(**models.LazyRecipe(**DATA).copy()),
+                         self.eager)
+
+        data = {}
+        data.update(models.LazyRecipe(**DATA).copy())
+        self.assertEqual(data, dict(self.eager))
+
+    def test_serialization(self):
+        self.assertEqual(json.loads(json.dumps(self.lazy)),
+                         json.loads(json.dumps(self.eager)))
+        self.assertEqual(
+            pickle.loads(pickle.dumps(models.LazyRecipe(**DATA), 2)),
+            self.eager)
+        self.assertEqual(copy.deepcopy(models.LazyRecipe(**DATA)),
+                         self.eager)
+
+
+class TestCompactLazyRecipe(unittest.TestCase):
+    """Test cases for slots based lazy recipe."""
+
+    def test_same_as_eager(self):
+        lazy = compact.LazyRecipe(**DATA)
+
+        self.assertEqual(lazy.name, DATA['name'])
+        self.assertEqual(lazy.flavors.meaty, 0.83)
+        self.assertEqual(lazy, compact.Recipe(**DATA))
+        self.assertEqual(compact.Recipe(**DATA), compact.LazyRecipe(**DATA))
+        self.assertEqual(
+            pickle.loads(pickle.dumps(compact.LazyRecipe(**DATA))),
+            compact.Recipe(**DATA))
+
+    def test_delete(self):
+        lazy = compact.LazyRecipe(**DATA)
+        eager = compact.Recipe(**DATA)
+        self.assertEqual(lazy.flavors.meaty, 0.83)
+        del lazy.flavors
+        del eager.flavors
+        del lazy.images
+        del eager.images
+
+        for key in ('flavors', 'images'):
+            self.assertFalse(key in lazy)
+            self.assertEqual(lazy.get(key), None)
+            self.assertRaises(KeyError, lambda: lazy[key])
+            self.assertRaises(AttributeError, getattr, lazy, key)
+
+        self.assertEqual(lazy, eager)
+        self.assertRaises(AttributeError, delattr, lazy, 'images')
+
+    def test_contains_not_hydrated(self):
+        lazy = compact.LazyRecipe(**DATA)
+
+        self.assertTrue('images' in lazy)
+        self.assertEqual(lazy._pending, set(lazy._lazy_fields))
+
+    def test_set_before_built(self):
+        lazy = compact.LazyRecipe(**DATA)
+        lazy.flavors = None
+
+        self.assertEqual(lazy.flavors, None)
+
+
+class TestClientLazy(unittest.TestCase):
+    """Test cases for client returning lazy recipes."""
+
+    def test_models(self):
+        client = yummly.Client(adapter=FakeAdapter(), lazy=True)
+        self.assertIsInstance(client.recipe('a'), models.LazyRecipe)
+
+        client = yummly.Client(adapter=FakeAdapter(), lazy=True, compact=True)
+        self.assertIsInstance(client.recipe('a'), compact.LazyRecipe)
@@ -0,0 +1,110 @@
+"""Test cases for client-side rate limiting.
+"""
+
+from multiprocessing import Process
+import os
+import shutil
+import tempfile
+from threading import Thread
+from time import time
+import unittest
+
+import yummly
+from yummly.ratelimit import FileTokenBucket, TokenBucket
+from .fakes import Clock, FakeAdapter
+
+
+def take_tokens(path, rate, count):
+    """Take `count` tokens from file token bucket at `path`."""
+    bucket = FileTokenBucket(path, rate, burst=1)
+    for _ in xrange(count):
+        bucket.acquire()
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for in-process token bucket."""
+
+    def test_burst_then_rate(self):
+        clock = Clock()
+        bucket = TokenBucket(2, burst=3, timer=clock, sleep=clock.sleep)
+
+        for _ in xrange(3):
+            self.assertEqual(bucket.acquire(), 0)
+
+        self.assertEqual(bucket.acquire(), 0.5)
+        self.assertEqual(bucket.acquire(), 0.5)
+        self.assertEqual(clock.now, 1)
+
+    def test_refill_capped(self):
+        clock = Clock()
+        bucket = TokenBucket(10, burst=2, timer=clock, sleep=clock.sleep)
+
+        clock.now = 100
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertAlmostEqual(bucket.try_acquire(), 0.1)
+
+    def test_threads(self):
+        bucket = TokenBucket(100, burst=1)
+        started = time()
+        threads = [Thread(target=lambda: [bucket.acquire()
+                                          for _ in xrange(5)])
+                   for _ in xrange(4)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # First token is taken from the full bucket.
+        self.assertTrue(time() - started >= 19 / 100.0 * 0.9)
+
+
+class TestFileTokenBucket(unittest.TestCase):
+    """Test cases for token bucket shared between processes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'bucket')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_shared_state(self):
+        clock = Clock()
+        first = FileTokenBucket(self.path, 1, burst=2, timer=clock)
+        second = FileTokenBucket(self.path, 1, burst=2, timer=clock)
+
+        self.assertEqual(first.try_acquire(), 0)
+        self.assertEqual(second.try_acquire(), 0)
+        self.assertEqual(first.try_acquire(), 1)
+
+        clock.now = 1
+        self.assertEqual(second.try_acquire(), 0)
+
+    def test_multiprocess(self):
+        started = time()
+        procs = [Process(target=take_tokens, args=(self.path, 50, 5))
+                 for _ in xrange(4)]
+
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+
+        self.assertTrue(time() - started >= 19 / 50.0 * 0.9)
+
+
+class TestClientRateLimit(unittest.TestCase):
+    """Test cases for client rate limiting."""
+
+    def test_requests_limited(self):
+        clock = Clock()
+        bucket = TokenBucket(1, timer=clock, sleep=clock.sleep)
+        client = yummly.Client(adapter=FakeAdapter(), rate_limiter=bucket)
+
+        client.recipe('a')
+        client.search('chicken')
+        client.metadata('diet')
+
+        self.assertEqual(clock.sleeps, [1, 1])
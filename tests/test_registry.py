@@ -0,0 +1,97 @@
+"""Test cases for metadata registry.
+"""
+
+from time import sleep
+import unittest
+
+import yummly
+from yummly.registry import MetadataRegistry
+from .fakes import FakeAdapter, jsonp_metadata
+
+
+class TestMetadataRegistry(unittest.TestCase):
+    """Test cases for indexed metadata registry."""
+
+    def route(self, request):
+        key = request.url.rsplit('/', 1)[1]
+        etag = '"{0}-v1"'.format(key)
+
+        if request.headers.get('If-None-Match') == etag:
+            return 304, '', {'ETag': etag}
+
+        return 200, jsonp_metadata(key), {'ETag': etag}
+
+    def setUp(self):
+        self.adapter = FakeAdapter(route=self.route)
+        self.client = yummly.Client(adapter=self.adapter)
+        self.registry = MetadataRegistry(self.client)
+
+    def test_lazy_load_once(self):
+        self.assertFalse('ingredient' in self.registry)
+
+        self.registry.all('ingredient')
+        self.registry.by_search_value('ingredient', 'salt')
+
+        self.assertTrue('ingredient' in self.registry)
+        self.assertEqual(len(self.adapter.requests), 1)
+
+    def test_lookups(self):
+        salt = self.registry.by_search_value('ingredient', 'salt')
+
+        self.assertIsInstance(salt, yummly.models.MetaIngredient)
+        self.assertTrue(self.registry.by_name('ingredient', 'SALT') is salt)
+        self.assertEqual(self.registry.by_search_value('ingredient', 'x'),
+                         None)
+
+        vegan = self.registry.by_id('diet', '386')
+        self.assertEqual(vegan.searchValue, '386^Vegan')
+        self.assertTrue(self.registry.by_name('diet', 'vegan') is vegan)
+
+        thai = self.registry.by_name('cuisine', 'thai')
+        self.assertEqual(thai.searchValue, 'cuisine^cuisine-thai')
+
+        kraft = self.registry.by_name('brand', 'kraft')
+        self.assertEqual(kraft.searchValue, 'Kraft')
+
+    def test_is_valid(self):
+        self.assertTrue(self.registry.is_valid('ingredient', 'bacon'))
+        self.assertFalse(self.registry.is_valid('ingredient', 'unicorn'))
+        self.assertTrue(self.registry.is_valid('cuisine',
+                                               'cuisine^cuisine-italian'))
+
+    def test_conditional_refresh(self):
+        category = self.registry.category('diet')
+        self.registry.refresh()
+
+        self.assertTrue(self.registry.category('diet') is category)
+        self.assertEqual(len(self.adapter.requests), 2)
+        self.assertEqual(self.adapter.requests[1].headers['If-None-Match'],
+                         '"diet-v1"')
+
+    def test_background_refresh(self):
+        registry = MetadataRegistry(self.client,
+                                    keys=['diet'],
+                                    refresh_interval=0.01)
+        registry.all('diet')
+        sleep(0.1)
+        registry.stop()
+
+        self.assertTrue(len(self.adapter.requests) > 2)
+        self.assertEqual(registry.last_error, None)
+
+    def test_compact(self):
+        client = yummly.Client(adapter=self.adapter, compact=True)
+        registry = MetadataRegistry(client)
+
+        self.assertIsInstance(registry.by_id('diet', '386'),
+                              yummly.compact.MetaDiet)
+        self.assertEqual(registry.by_name('ingredient', 'salt').term, 'salt')
+
+    def test_invalid_key(self):
+        self.assertRaises(yummly.YummlyError,
+                          MetadataRegistry,
+                          self.client,
+                          keys=['invalid'])
+
+        registry = MetadataRegistry(self.client, keys=['diet'])
+        self.assertRaises(yummly.YummlyError, registry.all, 'ingredient')
@@ -0,0 +1,140 @@
+"""Test cases for request retries.
+"""
+
+import unittest
+
+from requests.exceptions import ConnectionError, HTTPError
+
+import yummly
+from yummly.retry import RetryPolicy
+from .fakes import Clock, FakeAdapter, default_route
+
+
+def failing_route(*failures):
+    """Return route which fails with each of `failures` (a status or
+    exception) in turn before serving the default responses.
+    """
+    failures = list(failures)
+
+    def route(request):
+        if failures:
+            failure = failures.pop(0)
+
+            if isinstance(failure, Exception):
+                raise failure
+
+            return failure
+
+        return default_route(request)
+
+    return route
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test cases for retry delays."""
+
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5, max_time=None,
+                             jitter=False)
+
+        self.assertEqual([policy.delay(n, 0) for n in xrange(5)],
+                         [1, 2, 4, 5, 5])
+
+    def test_jitter(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5, max_time=None)
+
+        for n in xrange(5):
+            self.assertTrue(0 <= policy.delay(n, 0) <= min(2 ** n, 5))
+
+    def test_max_time(self):
+        clock = Clock()
+        policy = RetryPolicy(backoff=1, jitter=False, max_time=10, timer=clock)
+
+        clock.now = 7
+        self.assertEqual(policy.delay(1, 0), 2)
+
+        clock.now = 9
+        self.assertEqual(policy.delay(1, 0), None)
+
+    def test_statuses(self):
+        policy = RetryPolicy()
+
+        for status in (409, 429, 500, 503):
+            self.assertTrue(policy.is_retryable_status(status))
+        for status in (200, 304, 400, 404):
+            self.assertFalse(policy.is_retryable_status(status))
+
+
+class TestClientRetry(unittest.TestCase):
+    """Test cases for client request retries."""
+
+    def make_client(self, route, retries=3, **kargs):
+        self.clock = Clock()
+        self.adapter = FakeAdapter(route=route)
+        policy = RetryPolicy(timer=self.clock, sleep=self.clock.sleep,
+                             **kargs)
+
+        return yummly.Client(adapter=self.adapter,
+                             retries=retries,
+                             retry_policy=policy)
+
+    def test_retry_statuses(self):
+        client = self.make_client(failing_route((429, ''), (503, ''),
+                                                (409, '')),
+                                  jitter=False)
+        recipe = client.recipe('a')
+
+        self.assertEqual(recipe.id, 'a')
+        self.assertEqual(len(self.adapter.requests), 4)
+        self.assertEqual(client._handle_errors_count, 3)
+        self.assertEqual(self.clock.sleeps, [0.5, 1.0, 2.0])
+        self.assertEqual(client.last_call.attempts, 4)
+        self.assertEqual(client.last_call.delays, [0.5, 1.0, 2.0])
+        self.assertEqual(client.last_call.status, 200)
+        self.assertTrue(client.last_call.url.endswith('/recipe/a'))
+
+    def test_retry_connection_error(self):
+        client = self.make_client(failing_route(ConnectionError('reset')))
+
+        self.assertEqual(client.recipe('a').id, 'a')
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_retries_exhausted(self):
+        client = self.make_client(failing_route(*[(409, '')] * 5))
+
+        self.assertRaises(yummly.YummlyError, client.recipe, 'a')
+        self.assertEqual(len(self.adapter.requests), 4)
+
+        client = self.make_client(failing_route(*[ConnectionError()] * 5),
+                                  retries=1)
+
+        self.assertRaises(ConnectionError, client.recipe, 'a')
+        self.assertEqual(len(self.adapter.requests), 2)
+
+    def test_not_retried(self):
+        client = self.make_client(failing_route((404, '')))
+
+        self.assertRaises(HTTPError, client.recipe, 'a')
+        self.assertEqual(len(self.adapter.requests), 1)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_retry_after(self):
+        client = self.make_client(
+            failing_route((429, '', {'Retry-After': '7'})))
+        client.recipe('a')
+
+        self.assertEqual(self.clock.sleeps, [7.0])
+
+    def test_retry_after_exceeds_max_time(self):
+        client = self.make_client(
+            failing_route((503, '', {'Retry-After': '120'})),
+            max_time=60)
+
+        self.assertRaises(HTTPError, client.recipe, 'a')
+        self.assertEqual(len(self.adapter.requests), 1)
+
+    def test_no_retries(self):
+        client = self.make_client(failing_route((500, '')), retries=0)
+
+        self.assertRaises(HTTPError, client.recipe, 'a')
+        self.assertEqual(self.clock.sleeps, [])
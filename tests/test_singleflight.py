@@ -0,0 +1,180 @@
+"""Test cases for coalescing concurrent identical requests.
+"""
+
+from threading import Event, Thread
+from time import sleep, time
+import unittest
+
+from requests.exceptions import HTTPError
+
+import yummly
+from yummly.cache import MemoryCache
+from yummly.singleflight import SingleFlight
+from .fakes import FakeAdapter, default_route
+
+
+def call_concurrently(func, count=10):
+    """Call `func` from `count` threads at once and return list of results
+    (or raised exceptions).
+    """
+    results = [None] * count
+
+    def call(index):
+        try:
+            results[index] = func()
+        except Exception as exc:
+            results[index] = exc
+
+    threads = [Thread(target=call, args=(index,)) for index in xrange(count)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+def held_route(client, coalesced, path='', route=default_route, timeout=5):
+    """Return route holding requests for URLs containing `path` until
+    `coalesced` calls have been coalesced by `client` so that callers are
+    guaranteed to overlap.
+    """
+    released = Event()
+
+    def release():
+        deadline = time() + timeout
+
+        while client._in_flight.coalesced < coalesced and time() < deadline:
+            sleep(0.001)
+
+        released.set()
+
+    thread = Thread(target=release)
+    thread.daemon = True
+    thread.start()
+
+    def held(request):
+        if path in request.url:
+            released.wait()
+
+        return route(request)
+
+    return held
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for single-flight call group."""
+
+    def test_sequential_calls_not_shared(self):
+        group = SingleFlight()
+        calls = []
+
+        self.assertEqual(group.do('a', calls.append, 1), None)
+        self.assertEqual(group.do('a', calls.append, 2), None)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(len(group), 0)
+        self.assertEqual(group.coalesced, 0)
+
+    def test_exception_raised(self):
+        group = SingleFlight()
+
+        self.assertRaises(ZeroDivisionError, group.do, 'a', lambda: 1 / 0)
+        self.assertEqual(len(group), 0)
+
+
+class TestClientCoalescing(unittest.TestCase):
+    """Test cases for client request coalescing."""
+
+    def test_recipe(self):
+        adapter = FakeAdapter()
+        client = yummly.Client(adapter=adapter, coalesce=True)
+        adapter.route = held_route(client, 9)
+        recipes = call_concurrently(lambda: client.recipe('a'))
+
+        self.assertEqual(len(adapter.requests), 1)
+        self.assertEqual(client._in_flight.coalesced, 9)
+        self.assertTrue(all(recipe.id == 'a' for recipe in recipes))
+        # Each caller gets its own model and data.
+        self.assertEqual(len(set(id(recipe) for recipe in recipes)), 10)
+        self.assertEqual(len(set(id(recipe.ingredientLines)
+                                 for recipe in recipes)), 10)
+
+    def test_last_call(self):
+        adapter = FakeAdapter()
+        client = yummly.Client(adapter=adapter, coalesce=True)
+        adapter.route = held_route(client, 9, path='/recipe/')
+        queries = iter(xrange(10))
+
+        def call():
+            # Make a request of its own first.
+            client.search(str(next(queries)))
+            client.recipe('a')
+            return client.last_call
+
+        contexts = [context for context in call_concurrently(call)
+                    if context is not None]
+
+        self.assertEqual(len(contexts), 1)
+        self.assertTrue(contexts[0].url.endswith('/recipe/a'))
+
+    def test_distinct_params(self):
+        adapter = FakeAdapter()
+        client = yummly.Client(adapter=adapter, coalesce=True)
+        adapter.route = held_route(client, 8)
+        queries = iter(['chicken', 'beef'] * 5)
+
+        call_concurrently(lambda: client.search(next(queries)))
+
+        self.assertEqual(len(adapter.requests), 2)
+
+    def test_error_shared(self):
+        adapter = FakeAdapter()
+        client = yummly.Client(adapter=adapter, coalesce=True)
+        adapter.route = held_route(client, 9,
+                                   route=lambda request: (404, ''))
+        errors = call_concurrently(lambda: client.recipe('a'))
+
+        self.assertEqual(len(adapter.requests), 1)
+        self.assertTrue(all(isinstance(error, HTTPError)
+                            for error in errors))
+
+    def test_cache(self):
+        adapter = FakeAdapter()
+        cache = MemoryCache()
+        client = yummly.Client(adapter=adapter,
+                               cache=cache,
+                               coalesce=True)
+        adapter.route = held_route(client, 9)
+
+        call_concurrently(lambda: client.recipe('a'))
+        client.recipe('a')
+
+        self.assertEqual(len(adapter.requests), 1)
+        self.assertEqual(len(cache), 1)
+
+    def test_async_client(self):
+        adapter = FakeAdapter()
+
+        with yummly.AsyncClient(adapter=adapter, coalesce=True) as client:
+            adapter.route = held_route(client.client, 9)
+            results = [client.recipe('a') for _ in xrange(10)]
+            recipes = [result.get() for result in results]
+
+        self.assertEqual(len(adapter.requests), 1)
+        self.assertEqual(len(recipes), 10)
+
+    def test_disabled(self):
+        adapter = FakeAdapter(latency=0.1)
+        client = yummly.Client(adapter=adapter)
+
+        call_concurrently(lambda: client.recipe('a'))
+
+        self.assertEqual(len(adapter.requests), 10)
+
+    def test_disabled_unicode_params(self):
+        adapter = FakeAdapter()
+        client = yummly.Client(adapter=adapter)
+        client.search(u'chili', **{'allowedIngredient[]': [u'jalape\xf1o']})
+
+        self.assertIn('jalape%C3%B1o', adapter.requests[0].url)
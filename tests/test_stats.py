@@ -0,0 +1,79 @@
+"""Test cases for client instrumentation.
+"""
+
+import unittest
+
+import yummly
+from yummly.retry import RetryPolicy
+from yummly.stats import ClientStats
+from .fakes import FakeAdapter, default_route
+
+
+class TestClientStats(unittest.TestCase):
+    """Test cases for per-endpoint request statistics."""
+
+    def setUp(self):
+        self.stats = ClientStats()
+        self.client = yummly.Client(adapter=FakeAdapter(), stats=self.stats)
+
+    def test_endpoints(self):
+        self.client.recipe('a')
+        self.client.recipe('b')
+        self.client.search('chicken')
+        self.client.metadata('diet')
+
+        snapshot = self.stats.snapshot()
+
+        self.assertEqual(sorted(snapshot), ['metadata', 'recipe', 'search'])
+
+        recipe = snapshot['recipe']
+        self.assertEqual(recipe['calls'], 2)
+        self.assertEqual(recipe['attempts'], 2)
+        self.assertEqual(recipe['errors'], 0)
+        self.assertEqual(recipe['statuses'], {200: 2})
+        self.assertTrue(recipe['bytes'] > 0)
+        self.assertTrue(recipe['latency']['p50'] >= 0)
+        self.assertTrue(recipe['decode_time'] > 0)
+        self.assertTrue(recipe['build_time'] > 0)
+
+        self.assertTrue(snapshot['metadata']['build_time'] > 0)
+        self.assertTrue(snapshot['search']['build_time'] > 0)
+
+    def test_raw_not_built(self):
+        self.client.recipe('a', raw=True)
+
+        self.assertEqual(self.stats.snapshot()['recipe']['build_time'], 0)
+
+    def test_retries_and_errors(self):
+        statuses = [503, 404]
+
+        def route(request):
+            if statuses:
+                return statuses.pop(0), ''
+            return default_route(request)
+
+        client = yummly.Client(adapter=FakeAdapter(route=route),
+                               retries=1,
+                               retry_policy=RetryPolicy(backoff=0),
+                               stats=self.stats)
+
+        self.assertRaises(Exception, client.recipe, 'a')
+
+        recipe = self.stats.snapshot()['recipe']
+        self.assertEqual(recipe['calls'], 1)
+        self.assertEqual(recipe['attempts'], 2)
+        self.assertEqual(recipe['retries'], 1)
+        self.assertEqual(recipe['errors'], 1)
+        self.assertEqual(recipe['statuses'], {404: 1})
+
+    def test_pooled_calls(self):
+        self.client.recipes(['a', 'b'])
+
+        self.assertEqual(self.client.last_call, None)
+        self.assertEqual(self.stats.snapshot()['recipe']['calls'], 2)
+
+    def test_reset(self):
+        self.client.recipe('a')
+        self.stats.reset()
+
+        self.assertEqual(self.stats.snapshot(), {})
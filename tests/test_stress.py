@@ -0,0 +1,69 @@
+"""Stress test of a client shared between many threads.
+"""
+
+from threading import Lock
+import unittest
+
+import yummly
+from yummly.client import iter_concurrent
+from yummly.retry import RetryPolicy
+from .fakes import default_route
+from .stubserver import StubServer
+
+
+# Number of concurrent calls made and threads making them.
+CALLS = 2000
+THREADS = 50
+
+
+class TestSharedClient(unittest.TestCase):
+    """Test cases for per-call state of a client shared between threads."""
+
+    def setUp(self):
+        self.failed = set()
+        self.lock = Lock()
+        self.server = StubServer(route=self.route)
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def route(self, request):
+        """Fail first request for recipes whose id is a multiple of 3."""
+        recipe_id = request.url.rsplit('/', 1)[1]
+
+        if int(recipe_id) % 3 == 0:
+            with self.lock:
+                first = recipe_id not in self.failed
+                self.failed.add(recipe_id)
+
+            if first:
+                return 503, ''
+
+        return default_route(request)
+
+    def test_concurrent_calls(self):
+        client = self.server.configure(yummly.Client(
+            retries=2,
+            # Only retry the injected 503s so retry counts are exact.
+            retry_policy=RetryPolicy(backoff=0, errors=()),
+            pool_maxsize=THREADS,
+            coalesce=False))
+
+        def call(index):
+            recipe = client.recipe(str(index))
+            return recipe.id, client.last_call.retries
+
+        results = list(iter_concurrent(call, xrange(CALLS), THREADS))
+
+        self.assertEqual(len(results), CALLS)
+
+        for index, _, result, error in results:
+            # Connection errors aren't retried so any would surface here.
+            self.assertEqual(error, None)
+            self.assertEqual(result, (str(index), int(index % 3 == 0)))
+
+        # Every 503 served by the server was retried exactly once.
+        self.assertEqual(len(self.failed), len(xrange(0, CALLS, 3)))
+        self.assertEqual(sum(result[1] for _, _, result, _ in results),
+                         len(self.failed))
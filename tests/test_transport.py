@@ -0,0 +1,94 @@
+"""Test cases for recording and replaying API responses.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from time import time
+import unittest
+
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+
+import yummly
+from yummly.retry import RetryPolicy
+from yummly.transport import RecordingAdapter, ReplayAdapter
+from .fakes import FakeAdapter
+
+
+class TestRecordReplay(unittest.TestCase):
+    """Test cases for record/replay adapters."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'api.jsonl')
+
+        recorder = RecordingAdapter(self.path, adapter=FakeAdapter())
+        client = yummly.Client(api_id='id', api_key='secret',
+                               adapter=recorder)
+
+        self.recipe = client.recipe('a')
+        self.search = client.search('chicken', maxResult=5)
+        self.diets = client.metadata('diet')
+        self.ingredients = list(client.iter_metadata('ingredient'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_fixture(self):
+        with open(self.path) as fileobj:
+            records = [json.loads(line) for line in fileobj]
+
+        self.assertEqual(len(records), 4)
+        self.assertEqual(records[0]['status'], 200)
+        self.assertTrue(records[0]['url'].endswith('/recipe/a'))
+        self.assertFalse('secret' in open(self.path).read())
+
+    def test_replay(self):
+        adapter = ReplayAdapter(self.path)
+        client = yummly.Client(adapter=adapter)
+
+        self.assertEqual(len(adapter), 4)
+        self.assertEqual(client.recipe('a'), self.recipe)
+        self.assertEqual(client.metadata('diet'), self.diets)
+        self.assertEqual(list(client.iter_metadata('ingredient')),
+                         self.ingredients)
+        # Query params match in any order.
+        self.assertEqual(client.search(start=0, maxResult=5, q='chicken'),
+                         self.search)
+
+        self.assertRaises(ConnectionError, client.recipe, 'unknown')
+
+    def test_latency(self):
+        client = yummly.Client(adapter=ReplayAdapter(self.path, latency=0.05),
+                               timeout=1)
+        started = time()
+        client.recipe('a')
+
+        self.assertTrue(time() - started >= 0.05)
+
+        client.timeout = 0.01
+        self.assertRaises(Timeout, client.recipe, 'a')
+
+    def test_errors(self):
+        adapter = ReplayAdapter(self.path, error_rate=1)
+        client = yummly.Client(adapter=adapter)
+
+        self.assertRaises(HTTPError, client.recipe, 'a')
+
+        adapter = ReplayAdapter(self.path, error_rate=0.5, seed=1)
+        client = yummly.Client(adapter=adapter,
+                               retries=10,
+                               retry_policy=RetryPolicy(backoff=0))
+
+        for _ in xrange(10):
+            self.assertEqual(client.recipe('a').id, 'a')
+
+        self.assertTrue(len(adapter.requests) > 10)
+
+    def test_error_exception(self):
+        adapter = ReplayAdapter(self.path, error_rate=1,
+                                error_exception=ConnectionError('reset'))
+        client = yummly.Client(adapter=adapter)
+
+        self.assertRaises(ConnectionError, client.metadata, 'diet')
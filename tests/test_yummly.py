@@ -2,9 +2,10 @@
 import os
 import unittest
 import json
-from time import sleep
 
 import yummly
+from yummly.ratelimit import TokenBucket
+from yummly.transport import RecordingAdapter, ReplayAdapter
 
 HERE = os.path.dirname(__file__)
 
@@ -14,24 +15,30 @@ class TestYummly(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        config_file = os.path.join(HERE, 'config.json')
-
-        with open(config_file) as fileobj:
-            config = json.load(fileobj)
-
-        cls.yummly = yummly.Client(api_id=config['api_id'],
-                                   api_key=config['api_key'])
+        # Set `YUMMLY_RECORD` to a fixture path to record the responses of a
+        # live run and `YUMMLY_REPLAY` to replay them without network access.
+        record = os.environ.get('YUMMLY_RECORD')
+        replay = os.environ.get('YUMMLY_REPLAY')
+
+        if replay:
+            # Responses are delayed so that `test_timeout_retry` times out.
+            cls.yummly = yummly.Client(
+                adapter=ReplayAdapter(replay, latency=0.05))
+        else:
+            config_file = os.path.join(HERE, 'config.json')
+
+            with open(config_file) as fileobj:
+                config = json.load(fileobj)
+
+            # Throttle self to stay under the API's rate limit.
+            cls.yummly = yummly.Client(
+                api_id=config['api_id'],
+                api_key=config['api_key'],
+                adapter=RecordingAdapter(record) if record else None,
+                rate_limiter=TokenBucket(1))
 
         cls.sample_recipe_id = 'Hot-Turkey-Salad-Sandwiches-Allrecipes'
 
-    def setUp(self):
-        # Wait some time inbetween tests for throttling self.
-        TestYummly.wait()
-
-    @staticmethod
-    def wait(seconds=1.0):
-        sleep(seconds)
-
     def test_recipe(self):
         """Test fetching recipe data"""
         recipe = self.yummly.recipe(self.sample_recipe_id)
@@ -214,7 +221,6 @@ class TestYummly(unittest.TestCase):
         for key in self.yummly.METADATA:
             data = self.yummly.metadata(key)
             self.assertTrue(len(data) > 0)
-            TestYummly.wait(0.5)
 
     def test_metadata_invalid(self):
         self.assertRaises(yummly.YummlyError, self.yummly.metadata, 'invalid')
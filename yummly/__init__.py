@@ -3,7 +3,7 @@
 Core objects imported here.
 """
 
-from client import Client, YummlyError, Timeout
+from client import Client, AsyncClient, YummlyError, Timeout
 
 from .__meta__ import (
     __title__,
@@ -15,4 +15,4 @@ from .__meta__ import (
     __license__
 )
 
-__all__ = ['Client', 'YummlyError', 'Timeout']
+__all__ = ['Client', 'AsyncClient', 'YummlyError', 'Timeout']
@@ -0,0 +1,216 @@
+"""Local autocomplete index over ingredient metadata.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+import heapq
+import json
+
+import compact
+import models
+
+
+# Default number of suggestions returned.
+TOP_K = 10
+
+# Default n-gram size used for fuzzy matching.
+NGRAM = 3
+
+# Default minimum similarity score of fuzzy matches.
+MIN_SCORE = 0.3
+
+# Serialisation format version of `IngredientIndex.dump`.
+FORMAT_VERSION = 1
+
+
+def ngrams(text, n=NGRAM):
+    """Return set of character n-grams of `text` padded with spaces.
+
+    >>> sorted(ngrams('salt'))
+    ['  s', ' sa', 'alt', 'lt ', 'sal']
+    """
+    padded = ' ' * (n - 1) + text + ' '
+    return set(padded[i:i + n] for i in xrange(len(padded) - n + 1))
+
+
+class IngredientIndex(object):
+    """Autocomplete index of `models.MetaIngredient` terms.
+
+    Prefix lookups use binary search over the sorted, lowercased terms and
+    also match at the start of each word of a term (e.g. ``'bre'`` matches
+    ``'chicken breast'``). Fuzzy lookups rank terms by n-gram similarity.
+
+    :param ingredients: list of `models.MetaIngredient` objects (e.g. from
+        ``client.metadata('ingredient')``)
+    :param ngram: n-gram size for fuzzy matching. If ``0``, the fuzzy index
+        isn't built.
+    """
+
+    def __init__(self, ingredients=(), ngram=NGRAM):
+        self.items = list(ingredients)
+        self.ngram = ngram
+
+        terms, words = [], []
+
+        for position, item in enumerate(self.items):
+            term = item.term.lower()
+            terms.append((term, position))
+
+            # Also index term at the start of each subsequent word.
+            start = term.find(' ')
+            while start != -1:
+                words.append((term[start + 1:], position))
+                start = term.find(' ', start + 1)
+
+        terms.sort()
+        words.sort()
+
+        self._terms = [key for key, _ in terms]
+        self._term_positions = [position for _, position in terms]
+        self._words = [key for key, _ in words]
+        self._word_positions = [position for _, position in words]
+        self._grams = {}
+
+        if ngram:
+            grams = defaultdict(list)
+
+            for position, item in enumerate(self.items):
+                for gram in ngrams(item.term.lower(), ngram):
+                    grams[gram].append(position)
+
+            self._grams = dict(grams)
+
+    def __len__(self):
+        return len(self.items)
+
+    @classmethod
+    def from_client(cls, client, ngram=NGRAM):
+        """Build index from ingredient metadata fetched with `client`."""
+        return cls(client.metadata('ingredient'), ngram=ngram)
+
+    def prefix(self, prefix, k=TOP_K):
+        """Return up to `k` ingredients with a word starting with `prefix`.
+        Ingredients whose term starts with `prefix` are returned first.
+        """
+        prefix = prefix.lower()
+        results = self._scan(self._terms, self._term_positions, prefix, k)
+
+        if len(results) < k:
+            seen = set(results)
+            more = self._scan(self._words,
+                              self._word_positions,
+                              prefix,
+                              k - len(results),
+                              seen)
+            results.extend(more)
+
+        return [self.items[position] for position in results]
+
+    def _scan(self, keys, positions, prefix, k, seen=None):
+        """Return up to `k` positions whose sorted `keys` start with `prefix`
+        skipping positions in `seen`.
+        """
+        seen = set() if seen is None else seen
+        results = []
+        index = bisect_left(keys, prefix)
+
+        while (len(results) < k and
+               index < len(keys) and
+               keys[index].startswith(prefix)):
+            position = positions[index]
+            index += 1
+
+            if position not in seen:
+                seen.add(position)
+                results.append(position)
+
+        return results
+
+    def fuzzy(self, query, k=TOP_K, min_score=MIN_SCORE):
+        """Return up to `k` ingredients most similar to `query` ranked by
+        n-gram (Dice coefficient) similarity.
+        """
+        if not self.ngram:
+            return []
+
+        query_grams = ngrams(query.lower(), self.ngram)
+        counts = defaultdict(int)
+
+        for gram in query_grams:
+            for position in self._grams.get(gram, ()):
+                counts[position] += 1
+
+        size = len(query_grams)
+        scored = []
+
+        for position, count in counts.iteritems():
+            term = self.items[position].term
+            # Number of n-grams of term (padding included).
+            term_size = len(term) + 1
+            score = 2.0 * count / (size + term_size)
+
+            if score >= min_score:
+                scored.append((score, -term_size, position))
+
+        return [self.items[position]
+                for _, _, position in heapq.nlargest(k, scored)]
+
+    def suggest(self, query, k=TOP_K, min_score=MIN_SCORE):
+        """Return up to `k` suggestions for `query`. Prefix matches are
+        returned first followed by fuzzy matches.
+        """
+        results = self.prefix(query, k)
+
+        if len(results) < k:
+            seen = set(item.searchValue for item in results)
+
+            for item in self.fuzzy(query, k, min_score):
+                if item.searchValue not in seen:
+                    results.append(item)
+                    if len(results) == k:
+                        break
+
+        return results
+
+    def dump(self, fileobj):
+        """Serialise index as JSON to `fileobj`."""
+        compact_items = (bool(self.items) and
+                         isinstance(self.items[0], compact.Record))
+
+        json.dump({
+            'version': FORMAT_VERSION,
+            'ngram': self.ngram,
+            'models': 'compact' if compact_items else 'models',
+            'items': [item.to_dict() if compact_items else dict(item)
+                      for item in self.items],
+            'terms': self._terms,
+            'term_positions': self._term_positions,
+            'words': self._words,
+            'word_positions': self._word_positions,
+            'grams': self._grams,
+        }, fileobj, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, fileobj):
+        """Load index previously serialised with `dump` without rebuilding
+        it. Items are loaded as the same model type (`models` or `compact`)
+        they were dumped from.
+        """
+        state = json.load(fileobj)
+
+        if state.get('version') != FORMAT_VERSION:
+            raise ValueError('Unsupported ingredient index format')
+
+        module = compact if state.get('models') == 'compact' else models
+
+        index = cls.__new__(cls)
+        index.items = [module.MetaIngredient(**item)
+                       for item in state['items']]
+        index.ngram = state['ngram']
+        index._terms = state['terms']
+        index._term_positions = state['term_positions']
+        index._words = state['words']
+        index._word_positions = state['word_positions']
+        index._grams = state['grams']
+
+        return index
@@ -0,0 +1,128 @@
+"""Circuit breaker which fails requests fast while the API is failing.
+"""
+
+from collections import deque
+from threading import Lock
+from time import time
+
+
+# Circuit states.
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# Default failure rate at which the circuit opens.
+FAILURE_THRESHOLD = 0.5
+
+# Default number of most recent outcomes the failure rate is computed over.
+WINDOW = 20
+
+# Default min number of outcomes recorded before the circuit can open.
+MIN_CALLS = 10
+
+# Default seconds the circuit stays open before a trial request is allowed.
+RESET_TIMEOUT = 30.0
+
+
+class CircuitBreaker(object):
+    """Thread-safe circuit breaker.
+
+    While *closed*, all requests are allowed and their outcomes recorded.
+    Once the failure rate of the last `window` requests reaches `threshold`,
+    the circuit *opens* and requests are rejected for `reset_timeout`
+    seconds. Then the circuit is *half-open* and a single trial request is
+    allowed: if it succeeds, the circuit closes, otherwise it opens again.
+
+    :param threshold: failure rate (0-1) at which the circuit opens
+    :param window: number of most recent outcomes the rate is computed over
+    :param min_calls: min number of outcomes before the circuit can open
+    :param reset_timeout: seconds to reject requests once the circuit opened
+    :param timer: function returning the current time in seconds
+    """
+
+    def __init__(self,
+                 threshold=FAILURE_THRESHOLD,
+                 window=WINDOW,
+                 min_calls=MIN_CALLS,
+                 reset_timeout=RESET_TIMEOUT,
+                 timer=time):
+        assert(0 < threshold <= 1)
+        self.threshold = threshold
+
+        assert(window > 0 and 0 < min_calls <= window)
+        self.window = window
+        self.min_calls = min_calls
+
+        assert(reset_timeout >= 0)
+        self.reset_timeout = reset_timeout
+        self.timer = timer
+
+        self.state = CLOSED
+        self.opened = None
+
+        self._outcomes = deque()
+        self._failures = 0
+        self._trial = False
+        self._lock = Lock()
+
+    def allow(self):
+        """Return whether a request may be sent now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN:
+                if self.timer() - self.opened < self.reset_timeout:
+                    return False
+
+                self.state = HALF_OPEN
+                self._trial = False
+
+            # Only allow a single trial request while half-open.
+            if self._trial:
+                return False
+
+            self._trial = True
+            return True
+
+    def record(self, success):
+        """Record outcome of an allowed request."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if success:
+                    self._close()
+                else:
+                    self._open()
+            elif self.state == CLOSED:
+                if len(self._outcomes) == self.window:
+                    if not self._outcomes.popleft():
+                        self._failures -= 1
+
+                self._outcomes.append(success)
+
+                if not success:
+                    self._failures += 1
+
+                count = len(self._outcomes)
+
+                if (count >= self.min_calls and
+                        self._failures >= self.threshold * count):
+                    self._open()
+
+    def failure_rate(self):
+        """Return failure rate of recorded outcomes."""
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+
+            return float(self._failures) / len(self._outcomes)
+
+    def _open(self):
+        self.state = OPEN
+        self.opened = self.timer()
+
+    def _close(self):
+        self.state = CLOSED
+        self.opened = None
+        self._outcomes.clear()
+        self._failures = 0
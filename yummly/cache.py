@@ -0,0 +1,362 @@
+"""Response cache backends for `yummly.Client`.
+
+Caches store decoded API response data (i.e. before model construction) so
+that repeat requests for the same URL and params don't go to the network.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+from threading import local, Lock
+from time import time
+import zlib
+
+
+# Default max number of entries held by `MemoryCache`.
+MAXSIZE = 1024
+
+# Default max total size in bytes of compressed entries held by `SQLiteCache`.
+MAX_BYTES = 256 * 1024 * 1024
+
+# Default seconds to wait for another connection's lock on the database.
+LOCK_TIMEOUT = 30.0
+
+# Default min seconds between updates of an entry's access time by
+# `SQLiteCache.get`.
+ACCESS_INTERVAL = 60.0
+
+
+def copy_data(value):
+    """Return copy of decoded JSON `value` with its dicts and lists copied
+    recursively. Other values are immutable and shared.
+
+    >>> data = {'a': [1, {'b': 2}]}
+    >>> copy = copy_data(data)
+    >>> copy['a'][1]['b'] = 3
+    >>> data
+    {'a': [1, {'b': 2}]}
+    """
+    if isinstance(value, dict):
+        return dict((key, copy_data(item)) for key, item in value.iteritems())
+    elif isinstance(value, list):
+        return [copy_data(item) for item in value]
+
+    return value
+
+
+class Cache(object):
+    """Base class for cache backends.
+
+    Subclasses must implement `get`, `set`, `delete` and `clear` and should
+    update the `hits`, `misses` and `evictions` counters.
+
+    `get` must return a value which isn't shared with the cache or with
+    other callers, since models built from it are mutable.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return cached value for `key` or ``None`` if missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        """Cache `value` under `key` for `ttl` seconds (forever if ``None``).
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove `key` from cache."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove all entries from cache."""
+        raise NotImplementedError
+
+    def stats(self):
+        """Return cache hit/miss/eviction counters."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class MemoryCache(Cache):
+    """Thread-safe in-memory cache with LRU and TTL eviction.
+
+    Values are copied when set and returned so that callers can't modify
+    cached data.
+
+    :param maxsize: Max number of entries to keep. Once full, the least
+        recently used entry is evicted.
+    :param timer: Function returning the current time in seconds
+    """
+
+    def __init__(self, maxsize=MAXSIZE, timer=time):
+        super(MemoryCache, self).__init__()
+
+        assert(isinstance(maxsize, int) and maxsize > 0)
+        self.maxsize = maxsize
+        self.timer = timer
+
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires = entry
+
+            if expires is not None and expires <= self.timer():
+                self.misses += 1
+                self.evictions += 1
+                return None
+
+            # Re-insert to mark entry as most recently used.
+            self._data[key] = entry
+            self.hits += 1
+
+        return copy_data(value)
+
+    def set(self, key, value, ttl=None):
+        expires = None if ttl is None else self.timer() + ttl
+        value = copy_data(value)
+
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (value, expires)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCache(Cache):
+    """Disk cache storing zlib-compressed JSON in a single SQLite file.
+
+    The database is opened in WAL mode so that it can be shared by
+    concurrent readers and writers across threads and processes. Each thread
+    uses its own connection, and a process forked after a connection was
+    opened opens new ones instead of using the parent's.
+
+    Cache hits only write to the database to record an entry's access time
+    if it was last recorded more than `access_interval` seconds ago, so
+    least recently used order is tracked at that granularity. The total
+    size of entries is kept up to date by triggers instead of being summed
+    on every write.
+
+    :param path: Path of SQLite database file
+    :param max_bytes: Max total size of compressed entries. Once exceeded,
+        expired and then least recently used entries are evicted.
+    :param timeout: Seconds to wait for a lock held by another connection
+    :param timer: Function returning the current time in seconds
+    :param access_interval: Min seconds between updates of an entry's
+        access time
+    """
+
+    def __init__(self,
+                 path,
+                 max_bytes=MAX_BYTES,
+                 timeout=LOCK_TIMEOUT,
+                 timer=time,
+                 access_interval=ACCESS_INTERVAL):
+        super(SQLiteCache, self).__init__()
+
+        assert(max_bytes > 0)
+        assert(access_interval >= 0)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.timer = timer
+        self.access_interval = access_interval
+
+        self._local = local()
+
+        # Guards the counters, which are shared by all threads' connections.
+        self._lock = Lock()
+
+        # Connections inherited from a parent process. They're kept open
+        # since closing them could interfere with the parent's use of them.
+        self._inherited = []
+
+        with self._transaction() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS cache ('
+                         'key TEXT PRIMARY KEY, '
+                         'value BLOB NOT NULL, '
+                         'size INTEGER NOT NULL, '
+                         'expires REAL, '
+                         'accessed REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed '
+                         'ON cache (accessed)')
+
+            # Running total of entry sizes. Replaced entries are deleted by
+            # `INSERT OR REPLACE`, which fires the delete trigger as
+            # connections enable recursive triggers.
+            conn.execute('CREATE TABLE IF NOT EXISTS cache_size ('
+                         'total INTEGER NOT NULL)')
+            conn.execute('INSERT INTO cache_size (total) '
+                         'SELECT COALESCE(SUM(size), 0) FROM cache '
+                         'WHERE NOT EXISTS (SELECT 1 FROM cache_size)')
+            conn.execute('CREATE TRIGGER IF NOT EXISTS cache_insert '
+                         'AFTER INSERT ON cache BEGIN '
+                         'UPDATE cache_size SET total = total + new.size; '
+                         'END')
+            conn.execute('CREATE TRIGGER IF NOT EXISTS cache_delete '
+                         'AFTER DELETE ON cache BEGIN '
+                         'UPDATE cache_size SET total = total - old.size; '
+                         'END')
+
+    def __len__(self):
+        return self._connection().execute(
+            'SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def size(self):
+        """Return total size in bytes of compressed entries."""
+        return self._connection().execute(
+            'SELECT total FROM cache_size').fetchone()[0]
+
+    def _connection(self):
+        """Return connection for current thread and process."""
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is not None and self._local.pid != os.getpid():
+            # SQLite connections must not be used across `fork()`.
+            self._inherited.append(conn)
+            conn = None
+
+        if conn is None:
+            # Use autocommit mode and manage transactions explicitly.
+            conn = sqlite3.connect(self.path,
+                                   timeout=self.timeout,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA recursive_triggers=ON')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in a write transaction."""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+
+        try:
+            yield conn
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+    def get(self, key):
+        now = self.timer()
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT value, expires, accessed FROM cache WHERE key = ?',
+            (key,)).fetchone()
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        value, expires, accessed = row
+
+        if expires is not None and expires <= now:
+            with self._transaction() as conn:
+                conn.execute('DELETE FROM cache '
+                             'WHERE key = ? AND expires <= ?',
+                             (key, now))
+            with self._lock:
+                self.misses += 1
+                self.evictions += 1
+            return None
+
+        if now - accessed >= self.access_interval:
+            conn.execute('UPDATE cache SET accessed = ? WHERE key = ?',
+                         (now, key))
+        with self._lock:
+            self.hits += 1
+
+        return json.loads(zlib.decompress(str(value)))
+
+    def set(self, key, value, ttl=None):
+        now = self.timer()
+        expires = None if ttl is None else now + ttl
+        data = zlib.compress(json.dumps(value, separators=(',', ':')))
+
+        with self._transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO cache '
+                         '(key, value, size, expires, accessed) '
+                         'VALUES (?, ?, ?, ?, ?)',
+                         (key, sqlite3.Binary(data), len(data), expires, now))
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        """Evict entries until total size is within `max_bytes`."""
+        total = conn.execute('SELECT total FROM cache_size').fetchone()[0]
+
+        if total <= self.max_bytes:
+            return
+
+        cursor = conn.execute('DELETE FROM cache WHERE expires <= ?', (now,))
+        with self._lock:
+            self.evictions += cursor.rowcount
+
+        total = conn.execute('SELECT total FROM cache_size').fetchone()[0]
+        evicted = []
+
+        for key, size in conn.execute(
+                'SELECT key, size FROM cache ORDER BY accessed'):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        conn.executemany('DELETE FROM cache WHERE key = ?', evicted)
+        with self._lock:
+            self.evictions += len(evicted)
+
+    def delete(self, key):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM cache')
+
+    def close(self):
+        """Close connection for current thread."""
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is not None:
+            if self._local.pid == os.getpid():
+                conn.close()
+            else:
+                self._inherited.append(conn)
+            self._local.conn = None
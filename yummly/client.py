@@ -1,12 +1,26 @@
 """Python module for Yummly API: https://developer.yummly.com
 """
 
+from contextlib import contextmanager
 from functools import wraps
-import json
+from multiprocessing.pool import ThreadPool
+from Queue import Queue, Empty, Full
+import sys
+from threading import Event, Thread, local
+from time import time
+from urllib import urlencode
 
 import requests
-from requests.exceptions import Timeout
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException, Timeout
 
+from cache import copy_data
+import compact as compact_models
+from decoders import get_decoder, iter_array
+from interning import ValueTable
+from latency import LatencyHistogram
+from retry import RetryPolicy
+from singleflight import SingleFlight
 import models
 
 
@@ -15,27 +29,158 @@ import models
 TIMEOUT = 5.0
 RETRIES = 0
 
+# Connection pool defaults for the client's `requests.Session`.
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+MAX_RETRIES = 0
+
+# Default number of concurrent requests made by `AsyncClient`.
+MAX_WORKERS = 10
+
+# Default number of search result pages buffered by `Client.iter_search`.
+PREFETCH_PAGES = 1
+
+# Adaptive timeout defaults: timeouts are the `TIMEOUT_PERCENTILE` latency of
+# recent requests to an endpoint plus `TIMEOUT_MARGIN` seconds, at least
+# `MIN_TIMEOUT` seconds and at most the client's static `timeout`.
+TIMEOUT_PERCENTILE = 99
+TIMEOUT_MARGIN = 0.5
+MIN_TIMEOUT = 1.0
+
+# Default latency percentile after which a hedged request is sent.
+HEDGE_PERCENTILE = 95
+
+# Rankings of matches merged by `Client.multi_search` mapped to their sort
+# keys. Matches with equal keys keep the order they were first returned in.
+RANKINGS = {
+    'query': lambda match: 0,
+    'rating': lambda match: -(match_field(match, 'rating') or 0),
+    'totalTimeInSeconds': lambda match: (
+        match_field(match, 'totalTimeInSeconds') or float('inf')),
+}
+
+# Default size in bytes of response chunks read by `Client.iter_metadata`.
+CHUNK_SIZE = 64 * 1024
+
+# API endpoint names.
+ENDPOINTS = ('recipe', 'search', 'metadata')
+
+# Default time-to-live in seconds of cached responses per endpoint. A TTL of
+# `None` never expires and a TTL of `0` disables caching for that endpoint.
+CACHE_TTL = {
+    'recipe': 24 * 60 * 60,
+    'search': 5 * 60,
+    'metadata': 24 * 60 * 60,
+}
+
+
+class CallContext(object):
+    """State of a single API request including its retries.
+
+    Each thread gets its own context per request (see `Client.last_call`) so
+    a client can be shared between threads.
+
+    :param url: URL of endpoint requested
+    """
+
+    def __init__(self, url=None):
+        self.url = url
+        self.attempts = 0
+        self.delays = []
+        self.status = None
+        self.bytes = 0
+        self.started = time()
+        self.elapsed = None
+
+    def __repr__(self):
+        return '<CallContext {0} attempts={1} status={2}>'.format(
+            self.url, self.attempts, self.status)
+
+    @property
+    def retries(self):
+        """Number of times the request was retried."""
+        return max(0, self.attempts - 1)
+
+
+def utf8(value):
+    """Return `value` encoded as UTF-8 if it's a unicode string."""
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+
+    return value
+
+
+def response_size(response):
+    """Return size in bytes of `response` body without reading a streamed
+    body.
+    """
+    length = response.headers.get('Content-Length')
+
+    if length is not None and length.isdigit():
+        return int(length)
+    elif response._content_consumed:
+        return len(response.content or b'')
+
+    return 0
+
 
 def handle_errors(func):
-    """Decorator for handling Yummly errors"""
+    """Decorator for handling Yummly errors
+
+    Failed requests are retried up to `self.retries` times as decided by
+    `self.retry_policy`. Retries and timings of the request are tracked in a
+    `CallContext` local to the calling thread.
+    """
     @wraps(func)
     def decorated(self, *args, **kargs):
         # NOTE: `self` is the class this decorator wraps.
+        policy = self.retry_policy
+        started = policy.timer()
 
-        # Attach a count attribute to the function so we have a hook to test
-        # that retry works.
-        self._handle_errors_count = 0
+        context = CallContext(args[0] if args else kargs.get('url'))
+        self._local.context = context
 
-        # try to get response until retry limit reached
-        for retry in xrange(0, self.retries + 1):
-            try:
-                response = func(self, *args, **kargs)
-            except Timeout:
-                # stop retrying after reaching max
-                if retry == self.retries:
-                    raise
+        try:
+            # try to get response until retry limit reached
+            for retry in xrange(0, self.retries + 1):
+                context.attempts += 1
+
+                try:
+                    response = func(self, *args, **kargs)
+                except RequestException as exc:
+                    # stop retrying after reaching max
+                    if (retry == self.retries or
+                            not policy.is_retryable_error(exc)):
+                        raise
+
+                    delay = policy.delay(retry, started)
+
+                    if delay is None:
+                        raise
+                else:
+                    context.status = response.status_code
+                    context.bytes += response_size(response)
 
-                self._handle_errors_count += 1
+                    if (retry == self.retries or
+                            not policy.is_retryable_status(
+                                response.status_code)):
+                        break
+
+                    delay = policy.delay(retry, started, response)
+
+                    if delay is None:
+                        break
+
+                    # release connection back to the pool while waiting
+                    response.close()
+
+                context.delays.append(delay)
+                policy.sleep(delay)
+        finally:
+            context.elapsed = time() - context.started
+
+            if self.stats is not None:
+                self.stats.record_call(self._endpoint(context.url), context)
 
         status = response.status_code
 
@@ -52,6 +197,78 @@ def handle_errors(func):
     return decorated
 
 
+@contextmanager
+def extracting_metadata():
+    """Raise `YummlyError` for errors (other than `YummlyError` and request
+    errors) raised while extracting metadata from a response.
+    """
+    try:
+        yield
+    except (YummlyError, RequestException):
+        raise
+    except Exception:
+        raise YummlyError('Could not extract metadata due to malformed data')
+
+
+def iter_concurrent(func, items, max_workers=MAX_WORKERS):
+    """Call `func(item)` for each of `items` in a bounded thread pool.
+
+    Yields ``(index, item, result, error)`` tuples in completion order where
+    `error` is the exception raised by `func` (and `result` is ``None``) if
+    the call failed. At most `max_workers` calls are in flight at once and
+    `items` is consumed lazily so that a slow consumer applies backpressure.
+    """
+    assert(isinstance(max_workers, int) and max_workers > 0)
+
+    def call(index, item):
+        try:
+            return index, item, func(item), None
+        except Exception as exc:
+            return index, item, None, exc
+
+    pool = ThreadPool(max_workers)
+    done = Queue()
+    pending = 0
+
+    try:
+        for index, item in enumerate(items):
+            if pending >= max_workers:
+                yield done.get()
+                pending -= 1
+
+            pool.apply_async(call, (index, item), callback=done.put)
+            pending += 1
+
+        while pending:
+            yield done.get()
+            pending -= 1
+    finally:
+        pool.close()
+        pool.join()
+
+
+def match_field(match, key):
+    """Return `key` of search `match` or ``None`` if it's missing (e.g. from
+    raw responses).
+    """
+    return match[key] if key in match else None
+
+
+def sum_counts(total, counts):
+    """Add (possibly nested) `dict` of `counts` to `total` in place.
+
+    >>> total = {'a': 1, 'b': {'x': 1}}
+    >>> sum_counts(total, {'a': 2, 'b': {'x': 1, 'y': 3}})
+    >>> total == {'a': 3, 'b': {'x': 2, 'y': 3}}
+    True
+    """
+    for key, value in (counts or {}).iteritems():
+        if isinstance(value, dict):
+            sum_counts(total.setdefault(key, {}), value)
+        else:
+            total[key] = total.get(key, 0) + value
+
+
 class YummlyError(Exception):
     """Exception class for Yummly errors"""
     pass
@@ -60,10 +277,66 @@ class YummlyError(Exception):
 class Client(object):
     """Client class to connect to Yummly API: https://developer.yummly.com
 
+    Clients are safe to share between threads. State of each request (e.g.
+    its retries) is kept per thread in `last_call`.
+
     :param api_id: Yummly API ID
     :param api_key: Yummly API Key
     :param timeout: API request timeout
-    :param retries: Number of times to retry request if timeout received
+    :param retries: Number of times to retry a failed request (e.g. on
+        timeouts, connection errors, rate limiting or server errors)
+    :param session: Optional `requests.Session` to send requests with. Share
+        a single session between clients to share its connection pool.
+    :param adapter: Optional transport adapter (e.g.
+        `requests.adapters.HTTPAdapter`) to mount on the client's session.
+    :param pool_connections: Number of connection pools to cache
+    :param pool_maxsize: Max number of connections to keep in each pool
+    :param max_retries: Number of retries per connection for failed DNS
+        lookups, socket connections and connection timeouts
+    :param keep_alive: Whether to keep connections alive between requests
+    :param cache: Optional `yummly.cache.Cache` backend used to cache decoded
+        responses
+    :param cache_ttl: Optional dict of per-endpoint (``'recipe'``,
+        ``'search'``, ``'metadata'``) cache TTLs overriding `CACHE_TTL`
+    :param compact: Whether to return compact, `__slots__` based models from
+        `yummly.compact` instead of the `dict` based ones from
+        `yummly.models`
+    :param lazy: Whether recipes should build their nested models (e.g.
+        `nutritionEstimates`) on first access instead of on construction
+    :param raw: Whether to return decoded response data as is instead of
+        building model objects. Can be overridden per call.
+    :param json_decoder: JSON decoder used to parse responses. Either a name
+        accepted by `yummly.decoders.get_decoder` (e.g. ``'json'``) or a
+        decoder instance. Defaults to the fastest installed decoder.
+    :param intern_metadata: Whether metadata models should share a single
+        copy of values repeated across items (e.g. `type` and
+        `localesAvailableIn`, which become tuples) to reduce memory use
+    :param retry_policy: Optional `yummly.retry.RetryPolicy` deciding which
+        failures are retried and how long to wait in between. Defaults to
+        exponential backoff with jitter.
+    :param rate_limiter: Optional rate limiter (e.g.
+        `yummly.ratelimit.TokenBucket`) which every request (including
+        retries) waits on before being sent
+    :param coalesce: Whether concurrent calls for the same URL and params
+        should share a single in-flight request (and its result or error).
+        Each caller gets its own copy of the decoded response data.
+    :param hedge: Whether to send a duplicate request if a request hasn't
+        been answered within the `hedge_percentile` latency of recent
+        requests and use whichever response arrives first
+    :param hedge_percentile: Latency percentile (0-100) after which a hedged
+        request is sent
+    :param circuit_breaker: Optional `yummly.breaker.CircuitBreaker` which
+        rejects requests with a `YummlyError` while the API is failing
+    :param adaptive_timeout: Whether to derive each endpoint's timeout from
+        the latencies of its recent requests. `timeout` then is the max
+        timeout.
+    :param timeout_percentile: Latency percentile (0-100) adaptive timeouts
+        are based on
+    :param timeout_margin: Seconds added to the latency percentile
+    :param min_timeout: Min adaptive timeout
+    :param stats: Optional `yummly.stats.ClientStats` recording per-endpoint
+        request counts, latencies, bytes, statuses and decoding and model
+        building times
     """
 
     # API URLs
@@ -88,7 +361,31 @@ class Client(object):
                  api_id=None,
                  api_key=None,
                  timeout=TIMEOUT,
-                 retries=RETRIES):
+                 retries=RETRIES,
+                 session=None,
+                 adapter=None,
+                 pool_connections=POOL_CONNECTIONS,
+                 pool_maxsize=POOL_MAXSIZE,
+                 max_retries=MAX_RETRIES,
+                 keep_alive=True,
+                 cache=None,
+                 cache_ttl=None,
+                 compact=False,
+                 lazy=False,
+                 raw=False,
+                 json_decoder=None,
+                 intern_metadata=False,
+                 retry_policy=None,
+                 rate_limiter=None,
+                 coalesce=False,
+                 hedge=False,
+                 hedge_percentile=HEDGE_PERCENTILE,
+                 circuit_breaker=None,
+                 adaptive_timeout=False,
+                 timeout_percentile=TIMEOUT_PERCENTILE,
+                 timeout_margin=TIMEOUT_MARGIN,
+                 min_timeout=MIN_TIMEOUT,
+                 stats=None):
         self.api_id = api_id
         self.api_key = api_key
 
@@ -97,31 +394,169 @@ class Client(object):
 
         assert(isinstance(retries, int) and retries >= 0)
         self.retries = retries or 0
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._local = local()
+        self.stats = stats
+        self.rate_limiter = rate_limiter
+        self.coalesce = coalesce
+        self._in_flight = SingleFlight()
+
+        assert(0 < hedge_percentile <= 100)
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.circuit_breaker = circuit_breaker
+
+        assert(0 < timeout_percentile <= 100)
+        assert(timeout_margin >= 0 and min_timeout >= 0)
+        self.adaptive_timeout = adaptive_timeout
+        self.timeout_percentile = timeout_percentile
+        self.timeout_margin = timeout_margin
+        self.min_timeout = min_timeout
+
+        # Latencies of recent requests per endpoint.
+        self.latencies = dict((endpoint, LatencyHistogram())
+                              for endpoint in ENDPOINTS)
+
+        self.session = session or self._create_session(
+            adapter=adapter,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries)
+
+        self.keep_alive = keep_alive
+
+        self.cache = cache
+        self.cache_ttl = dict(CACHE_TTL, **(cache_ttl or {}))
+
+        self.compact = compact
+        self.models = compact_models if compact else models
+        self.lazy = lazy
+        self.raw = raw
 
-    def recipe(self, recipe_id):
+        if json_decoder is None or isinstance(json_decoder, basestring):
+            json_decoder = get_decoder(json_decoder)
+
+        self.json_decoder = json_decoder
+
+        self.shared_values = ValueTable() if intern_metadata else None
+
+    @property
+    def last_call(self):
+        """`CallContext` of the last API request made by the calling thread
+        or ``None``. Calls served from the cache or coalesced with another
+        thread's request don't make a request of their own.
+
+        Only synchronous calls are covered. Requests made on pool threads by
+        `recipes`, `iter_recipes`, `warm`, `multi_search`, `hydrate` and
+        `AsyncClient` don't update the calling thread's context. Use `stats`
+        (e.g. a `ClientStats` subclass overriding `record_call`) to observe
+        them.
+        """
+        return getattr(self._local, 'context', None)
+
+    @property
+    def _handle_errors_count(self):
+        # Retries of calling thread's last request.
+        context = self.last_call
+        return context.retries if context is not None else 0
+
+    def recipe(self, recipe_id, raw=None):
         """Yummly get recipe API request
 
         :param recipe_id: recipe id
+        :param raw: whether to return decoded response data instead of
+            `models.Recipe` (defaults to `Client.raw`)
         """
 
         url = self.URL_GET + recipe_id
-        response = self._request(url)
-        result = self._extract_response(response)
+        result = self._fetch('recipe', url)
+
+        if self._is_raw(raw):
+            return result
+
+        # NOTE: due to `yield` being a keyword, use `yields` instead. Copy
+        # result to leave (possibly cached) source unmodified.
+        result = dict(result, yields=result.get('yield', ''))
 
-        # NOTE: due to `yield` being a keyword, use `yields` instead
-        result['yields'] = result.get('yield', '')
+        if self.lazy:
+            Recipe = self.models.LazyRecipe
+        else:
+            Recipe = self.models.Recipe
 
-        recipe = models.Recipe(**result)
+        return self._timed('recipe', 'build', Recipe, **result)
+
+    def recipes(self, recipe_ids, max_workers=MAX_WORKERS):
+        """Fetch multiple recipes concurrently.
+
+        Failures for individual recipes (e.g. timeouts, 404s, `YummlyError`)
+        don't abort the batch. Instead, they are collected in the returned
+        batch's `errors` and the corresponding entry in `recipes` is ``None``.
+
+        :param recipe_ids: list of recipe ids
+        :param max_workers: max number of concurrent requests
+        :returns: `models.RecipeBatch` with `recipes` in the same order as
+            `recipe_ids`
+        """
+
+        recipe_ids = list(recipe_ids)
+        recipes = [None] * len(recipe_ids)
+        errors = {}
+
+        results = iter_concurrent(self.recipe, recipe_ids, max_workers)
+
+        for index, recipe_id, recipe, error in results:
+            if error is None:
+                recipes[index] = recipe
+            else:
+                errors[recipe_id] = error
 
-        return recipe
+        return models.RecipeBatch(recipes=recipes, errors=errors)
 
-    def search(self, q, maxResult=40, start=0, **params):
+    def iter_recipes(self, recipe_ids, max_workers=MAX_WORKERS):
+        """Fetch multiple recipes concurrently and yield them in completion
+        order as ``(recipe_id, recipe, error)`` tuples.
+
+        If fetching a recipe failed, `recipe` is ``None`` and `error` is the
+        exception raised.
+
+        :param recipe_ids: iterable of recipe ids
+        :param max_workers: max number of concurrent requests
+        """
+
+        results = iter_concurrent(self.recipe, recipe_ids, max_workers)
+
+        for _, recipe_id, recipe, error in results:
+            yield recipe_id, recipe, error
+
+    def warm(self, recipe_ids, max_workers=MAX_WORKERS):
+        """Load recipes into the cache concurrently without building models.
+
+        :param recipe_ids: iterable of recipe ids
+        :param max_workers: max number of concurrent requests
+        :returns: dict of recipe ids which failed to load mapped to the
+            exception raised
+        """
+
+        if self.cache is None:
+            raise YummlyError('Cannot warm cache: no cache configured')
+
+        def fetch(recipe_id):
+            return self._fetch('recipe', self.URL_GET + recipe_id)
+
+        return dict((recipe_id, error)
+                    for _, recipe_id, _, error
+                    in iter_concurrent(fetch, recipe_ids, max_workers)
+                    if error is not None)
+
+    def search(self, q, maxResult=40, start=0, raw=None, **params):
         """Yummly search recipe API request
 
         :param q: search string
         :param maxResult: max results
         :param start: pagination offset in # of records (e.g. start=5 means
             skip first 5 results)
+        :param raw: whether to return decoded response data instead of
+            `models.SearchResult` (defaults to `Client.raw`)
         :param **params: optional kargs corresponding to Yummly supported
             search parameters
         """
@@ -136,15 +571,312 @@ class Client(object):
             'start': start
         })
 
-        response = self._request(url, params=params)
-        result = self._extract_response(response)
+        result = self._fetch('search', url, params=params)
 
-        search_result = models.SearchResult(**result)
+        if self._is_raw(raw):
+            return result
+
+        search_result = self._timed('search', 'build',
+                                    self.models.SearchResult, **result)
 
         return search_result
 
-    def metadata(self, key):
-        """Return metadata for given `key`."""
+    def multi_search(self,
+                     queries,
+                     max_workers=MAX_WORKERS,
+                     rank='query',
+                     raw=None):
+        """Run multiple searches concurrently and merge their matches.
+
+        Matches returned by several queries are merged by `id`, keeping the
+        first one returned. `totalMatchCount` and `facetCounts` are summed
+        over all successful queries, so they count such matches repeatedly.
+        Failures of individual queries don't abort the others. Instead, they
+        are collected in the returned result's `errors`.
+
+        :param queries: list of search strings or of dicts of `search`
+            kargs (e.g. ``{'q': 'soup', 'allowedCuisine[]': [...]}``)
+        :param max_workers: max number of concurrent requests
+        :param rank: order of merged matches: ``'query'`` (order of queries
+            and of matches within their results), ``'rating'`` (highest
+            first), ``'totalTimeInSeconds'`` (quickest first), or a callable
+            taking a match and returning its sort key. Ties keep query order.
+        :param raw: whether to merge decoded response data instead of
+            `models.SearchMatch` objects (defaults to `Client.raw`)
+        :returns: `models.MultiSearchResult` with `errors` mapping indexes
+            of failed queries to the exception raised and `sources` mapping
+            match ids to indexes of the queries which returned them
+        """
+
+        key = rank if callable(rank) else RANKINGS.get(rank)
+
+        if key is None:
+            raise YummlyError('Unknown ranking: {0}'.format(rank))
+
+        queries = [{'q': query} if isinstance(query, basestring) else query
+                   for query in queries]
+        results = [None] * len(queries)
+        errors = {}
+
+        def search(kargs):
+            return self.search(raw=raw, **kargs)
+
+        for index, _, result, error in iter_concurrent(search, queries,
+                                                       max_workers):
+            if error is None:
+                results[index] = result
+            else:
+                errors[index] = error
+
+        total = 0
+        facet_counts = {}
+        matches = []
+        sources = {}
+
+        for index, result in enumerate(results):
+            if result is None:
+                continue
+
+            total += result['totalMatchCount']
+            sum_counts(facet_counts, result['facetCounts'])
+
+            for match in result['matches']:
+                if match['id'] not in sources:
+                    sources[match['id']] = []
+                    matches.append(match)
+                sources[match['id']].append(index)
+
+        matches.sort(key=key)
+
+        return models.MultiSearchResult(totalMatchCount=total,
+                                        facetCounts=facet_counts,
+                                        matches=matches,
+                                        errors=errors,
+                                        sources=sources)
+
+    def iter_search(self,
+                    q,
+                    page_size=40,
+                    limit=None,
+                    prefetch=PREFETCH_PAGES,
+                    **params):
+        """Yield `models.SearchMatch` objects across all search result pages.
+
+        Pages are fetched in a background thread so that the next page is
+        downloaded while the current one is consumed. At most `prefetch`
+        pages are buffered at once. Iteration stops once `totalMatchCount`
+        or `limit` matches have been yielded.
+
+        :param q: search string
+        :param page_size: max results per page request
+        :param limit: max total results to yield
+        :param prefetch: max number of pages to buffer ahead of the consumer
+        :param **params: optional kargs corresponding to Yummly supported
+            search parameters
+        """
+
+        assert(isinstance(page_size, int) and page_size > 0)
+        assert(isinstance(prefetch, int) and prefetch > 0)
+
+        pages = Queue(maxsize=prefetch)
+        stop = Event()
+
+        def put(page, error=None):
+            # Give up once the consumer has stopped iterating.
+            while not stop.is_set():
+                try:
+                    pages.put((page, error), timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def fetch_pages():
+            start = 0
+
+            try:
+                while limit is None or start < limit:
+                    max_result = page_size
+                    if limit is not None:
+                        max_result = min(page_size, limit - start)
+
+                    page = self.search(q, max_result, start, **params)
+
+                    # NOTE: Use item access to support raw responses.
+                    if not page['matches'] or not put(page):
+                        break
+
+                    start += len(page['matches'])
+
+                    if start >= page['totalMatchCount']:
+                        break
+            except Exception as exc:
+                put(None, exc)
+            else:
+                put(None)
+
+        fetcher = Thread(target=fetch_pages)
+        fetcher.daemon = True
+        fetcher.start()
+
+        try:
+            while True:
+                page, error = pages.get()
+
+                if error is not None:
+                    raise error
+                elif page is None:
+                    break
+
+                for match in page['matches']:
+                    yield match
+        finally:
+            stop.set()
+
+    def hydrate(self, matches, max_workers=MAX_WORKERS):
+        """Fetch the full recipe of each search match concurrently and yield
+        them in completion order as ``(match, recipe, error)`` tuples.
+
+        `matches` is consumed lazily: at most `max_workers` recipes are being
+        fetched or waiting to be consumed at once, so a slow consumer stops
+        further matches (and search pages from `iter_search`) from being
+        fetched. If fetching a recipe failed, `recipe` is ``None`` and
+        `error` is the exception raised. Errors raised by `matches` itself
+        are propagated.
+
+        :param matches: iterable of `models.SearchMatch` objects (e.g.
+            `iter_search`) or of `models.SearchResult` pages
+        :param max_workers: max number of concurrent recipe requests
+        """
+
+        def iter_matches():
+            for item in matches:
+                # NOTE: Use item access to support raw responses.
+                if 'matches' in item:
+                    for match in item['matches']:
+                        yield match
+                else:
+                    yield item
+
+        def fetch(match):
+            return self.recipe(match['id'])
+
+        results = iter_concurrent(fetch, iter_matches(), max_workers)
+
+        try:
+            for _, match, recipe, error in results:
+                yield match, recipe, error
+        finally:
+            results.close()
+
+            # Stop background fetching of search pages.
+            if hasattr(matches, 'close'):
+                matches.close()
+
+    def iter_search_recipes(self,
+                            q,
+                            page_size=40,
+                            limit=None,
+                            prefetch=PREFETCH_PAGES,
+                            max_workers=MAX_WORKERS,
+                            **params):
+        """Search and yield full recipes of all matches as they arrive as
+        ``(match, recipe, error)`` tuples.
+
+        Recipes are fetched concurrently while the next search page is
+        prefetched (see `iter_search` and `hydrate`).
+
+        :param q: search string
+        :param page_size: max results per page request
+        :param limit: max total results to yield
+        :param prefetch: max number of pages to buffer ahead of the consumer
+        :param max_workers: max number of concurrent recipe requests
+        :param **params: optional kargs corresponding to Yummly supported
+            search parameters
+        """
+
+        matches = self.iter_search(q, page_size, limit, prefetch, **params)
+
+        return self.hydrate(matches, max_workers)
+
+    def metadata(self, key, raw=None):
+        """Return metadata for given `key`.
+
+        :param key: metadata key (see `METADATA`)
+        :param raw: whether to return decoded response data instead of
+            `Meta*` models (defaults to `Client.raw`)
+        """
+        MetaClass = self._metadata_class(key)
+        url = '{0}/{1}'.format(self.URL_META, key)
+
+        with extracting_metadata():
+            data = self._fetch('metadata', url, extract=self._extract_metadata)
+
+            if not self._is_raw(raw):
+                data = self._timed('metadata', 'build', self._metadata_items,
+                                   MetaClass, data)
+
+        return data
+
+    def _create_session(self,
+                        adapter=None,
+                        pool_connections=POOL_CONNECTIONS,
+                        pool_maxsize=POOL_MAXSIZE,
+                        max_retries=MAX_RETRIES):
+        """Create long-lived session with a pooled adapter mounted."""
+        if adapter is None:
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=max_retries)
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        return session
+
+    def close(self):
+        """Close session and its pooled connections."""
+        self.session.close()
+
+    def iter_metadata(self, key, chunk_size=CHUNK_SIZE, raw=None):
+        """Yield metadata for given `key` one item at a time while the
+        response is streamed so that the whole response never has to be held
+        in memory. Responses aren't cached.
+
+        :param key: metadata key (see `METADATA`)
+        :param chunk_size: size in bytes of response chunks to read
+        :param raw: whether to yield decoded data instead of `Meta*` models
+            (defaults to `Client.raw`)
+        """
+        MetaClass = self._metadata_class(key)
+        url = '{0}/{1}'.format(self.URL_META, key)
+        raw = self._is_raw(raw)
+
+        response = self._request(url, stream=True)
+
+        try:
+            items = iter_array(response.iter_content(chunk_size))
+
+            while True:
+                with extracting_metadata():
+                    md = next(items, None)
+
+                    if md is None:
+                        break
+
+                    item = (md if raw
+                            else self._metadata_item(MetaClass, md))
+
+                yield item
+        finally:
+            response.close()
+
+    def _metadata_class(self, key):
+        """Return model class of configured model module for metadata
+        `key`.
+        """
         MetaClass = self.METADATA.get(key)
 
         if not MetaClass:
@@ -152,55 +884,272 @@ class Client(object):
                 'Invalid metadata key. '
                 'Valid keys are:' + ', '.join(self.METADATA.keys()))
 
-        url = '{0}/{1}'.format(self.URL_META, key)
-        response = self._request(url)
+        # Use equivalent class of configured model module.
+        return getattr(self.models, MetaClass.__name__)
 
-        try:
-            data = [MetaClass(**md) for md in self._extract_metadata(response)]
-        except Exception:
-            raise YummlyError(
-                'Could not extract metadata due to malformed data')
+    def _metadata_items(self, MetaClass, items):
+        """Build list of metadata models from `items` data."""
+        return [self._metadata_item(MetaClass, md) for md in items]
 
-        return data
+    def _metadata_item(self, MetaClass, data):
+        """Build metadata model from item `data`, sharing repeated values
+        if `intern_metadata` is enabled.
+        """
+        if self.shared_values is not None:
+            data = self.shared_values.compact(data)
+
+        return MetaClass(**data)
+
+    def _timed(self, endpoint, phase, func, *args, **kargs):
+        """Return ``func(*args, **kargs)`` recording its duration as
+        `phase` of a call to `endpoint` if `stats` are enabled.
+        """
+        if self.stats is None:
+            return func(*args, **kargs)
+
+        started = time()
+        result = func(*args, **kargs)
+        self.stats.record_time(endpoint, phase, time() - started)
+
+        return result
+
+    def _is_raw(self, raw):
+        """Return whether to skip building models for a call."""
+        return self.raw if raw is None else raw
+
+    def _fetch(self, endpoint, url, params=None, extract=None):
+        """Request `url` and return its decoded response data. Data is
+        served from and stored in the cache when one is configured.
+        Concurrent identical fetches are coalesced if `coalesce` is enabled.
+
+        :param endpoint: endpoint name used to look up cache TTL
+        :param url: URL of endpoint
+        :param params: GET params of request
+        :param extract: function which decodes response (defaults to
+            `_extract_response`)
+        """
+
+        extract = extract or self._extract_response
+        ttl = self.cache_ttl.get(endpoint)
+        cached = self.cache is not None and ttl != 0
+
+        if cached or self.coalesce:
+            key = self._cache_key(url, params)
+
+        # Calls which don't make a request have no context of their own.
+        self._local.context = None
+
+        if cached:
+            data = self.cache.get(key)
+
+            if data is not None:
+                return data
+
+        led = []
+
+        def load():
+            led.append(True)
+            response = self._request(url, params=params)
+            data = self._timed(endpoint, 'decode', extract, response)
+
+            # NOTE: Store data before the in-flight call completes so that
+            # later calls find it in the cache.
+            if cached:
+                self.cache.set(key, data, ttl)
+
+            return data
+
+        if self.coalesce:
+            data = self._in_flight.do(key, load)
+
+            # Don't share data of another thread's request.
+            return data if led else copy_data(data)
+
+        return load()
+
+    def _cache_key(self, url, params=None):
+        """Return cache key for `url` with canonicalised `params`."""
+        if not params:
+            return url
+
+        items = []
+
+        for name, value in sorted(params.items()):
+            if isinstance(value, (list, tuple)):
+                value = [utf8(item) for item in value]
+
+            items.append((utf8(name), utf8(value)))
+
+        return url + '?' + urlencode(items, doseq=True)
 
     @handle_errors
-    def _request(self, url, params=None):
+    def _request(self, url, params=None, headers=None, stream=False):
         """Generic yummly request which attaches meta info (e.g. auth)
 
         :param url: URL of endpoint
         :param params: GET params of request
+        :param headers: additional headers of request
+        :param stream: whether to defer downloading the response body
         """
 
+        # copy headers to leave source unmodified
+        headers = dict(headers or {})
+
         # set auth headers
-        headers = {
+        headers.update({
             'X-Yummly-App-ID':  self.api_id,
             'X-Yummly-App-Key': self.api_key,
-        }
+        })
+
+        if not self.keep_alive:
+            headers['Connection'] = 'close'
 
-        response = requests.get(url,
-                                params=params,
-                                headers=headers,
-                                timeout=self.timeout)
+        latency = self.latencies[self._endpoint(url)]
+        timeout = self._timeout(latency)
+        breaker = self.circuit_breaker
+
+        if breaker is not None and not breaker.allow():
+            raise YummlyError(
+                'Circuit breaker open: API requests are failing')
+
+        def send():
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            started = time()
+
+            try:
+                response = self.session.get(url,
+                                            params=params,
+                                            headers=headers,
+                                            timeout=timeout,
+                                            stream=stream)
+            except Timeout:
+                # Request took at least as long as the timeout.
+                latency.record(timeout)
+                raise
+
+            # NOTE: Only the headers of streamed responses have been read so
+            # their latency isn't comparable.
+            if response.status_code < 500 and not stream:
+                latency.record(time() - started)
+
+            return response
+
+        try:
+            # NOTE: Streamed responses aren't hedged since their body is
+            # read after the request returns.
+            if self.hedge and not stream:
+                response = self._send_hedged(send, latency)
+            else:
+                response = send()
+        except Exception:
+            if breaker is not None:
+                breaker.record(False)
+            raise
+
+        if breaker is not None:
+            breaker.record(response.status_code < 500)
 
         return response
 
+    def _endpoint(self, url):
+        """Return name of endpoint `url` belongs to."""
+        for endpoint, prefix in (('recipe', self.URL_GET),
+                                 ('search', self.URL_SEARCH),
+                                 ('metadata', self.URL_META)):
+            if url.startswith(prefix):
+                return endpoint
+
+        raise YummlyError('Unknown API endpoint: ' + url)
+
+    def _timeout(self, latency):
+        """Return timeout of a request to endpoint with `latency`
+        histogram.
+        """
+        if not self.adaptive_timeout:
+            return self.timeout
+
+        observed = latency.percentile(self.timeout_percentile)
+
+        if observed is None:
+            # Not enough latencies recorded yet.
+            return self.timeout
+
+        timeout = max(self.min_timeout, observed + self.timeout_margin)
+
+        return min(self.timeout, timeout)
+
+    def _send_hedged(self, send, latency):
+        """Call `send` and call it again in parallel if it hasn't returned
+        within the `hedge_percentile` of endpoint `latency` histogram. Return
+        the first successful response. Server errors (``5xx``) and raised
+        errors only end the race if no other call is still pending.
+        """
+        delay = latency.percentile(self.hedge_percentile)
+
+        if delay is None:
+            # Not enough latencies recorded yet to know when to hedge.
+            return send()
+
+        results = Queue()
+
+        def attempt():
+            try:
+                results.put((send(), None))
+            except Exception:
+                results.put((None, sys.exc_info()))
+
+        def start():
+            thread = Thread(target=attempt)
+            thread.daemon = True
+            thread.start()
+
+        start()
+        pending = 1
+        hedged = False
+
+        while True:
+            try:
+                response, exc_info = results.get(
+                    timeout=None if hedged else delay)
+            except Empty:
+                start()
+                pending += 1
+                hedged = True
+                continue
+
+            pending -= 1
+
+            if exc_info is None and response.status_code < 500:
+                return response
+            if not pending:
+                if exc_info is None:
+                    return response
+                raise exc_info[0], exc_info[1], exc_info[2]
+            if response is not None:
+                # release connection of discarded response
+                response.close()
+
     def _extract_response(self, response):
         """Extract data from api resposne"""
-        return response.json()
+        return self.json_decoder.loads(response.content)
 
     def _extract_metadata(self, response):
         """Extract data from metadata response
 
         NOTE: metadata responses are jsonp strings of the form:
             set_metadata('meta name', [{...}, {...}, ...]);
+
+        The list is decoded straight from the response bytes without
+        decoding them to text or copying the list's slice.
         """
 
-        text = response.text
-        start = text.index('[')
-        end = text.rfind(']') + 1
-        parsed = text[start:end]
+        content = response.content
+        start = content.index(b'[')
+        end = content.rindex(b']') + 1
 
-        return json.loads(parsed)
+        return self.json_decoder.loads_slice(content, start, end)
 
     def _filter_data(self, data, Model):
         """Filter data using fields supported by Model."""
@@ -210,3 +1159,58 @@ class Client(object):
                 filtered[f] = data[f]
 
         return filtered
+
+
+class AsyncClient(object):
+    """Client which runs Yummly API requests concurrently in a bounded thread
+    pool.
+
+    Each API method returns immediately with a
+    `multiprocessing.pool.AsyncResult` whose `get()` returns the same model
+    objects (or raises the same errors) as the corresponding `Client` method.
+    Requests run on pool threads, so they aren't reflected in the client's
+    `last_call`.
+
+    :param client: `Client` used to make requests. If not provided, one is
+        created using `**kargs`.
+    :param max_workers: Max number of concurrent requests
+    """
+
+    def __init__(self, client=None, max_workers=MAX_WORKERS, **kargs):
+        assert(isinstance(max_workers, int) and max_workers > 0)
+        self.max_workers = max_workers
+
+        if client is None:
+            # Size the connection pool so each worker can keep its
+            # connection alive.
+            kargs.setdefault('pool_maxsize', max_workers)
+            client = Client(**kargs)
+
+        self.client = client
+        self.pool = ThreadPool(max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def recipe(self, recipe_id, raw=None):
+        """Asynchronous `Client.recipe`."""
+        return self.pool.apply_async(self.client.recipe, (recipe_id, raw))
+
+    def search(self, q, maxResult=40, start=0, raw=None, **params):
+        """Asynchronous `Client.search`."""
+        return self.pool.apply_async(self.client.search,
+                                     (q, maxResult, start, raw),
+                                     params)
+
+    def metadata(self, key, raw=None):
+        """Asynchronous `Client.metadata`."""
+        return self.pool.apply_async(self.client.metadata, (key, raw))
+
+    def close(self):
+        """Wait for pending requests to finish and close the pool."""
+        self.pool.close()
+        self.pool.join()
+        self.client.close()
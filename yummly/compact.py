@@ -0,0 +1,468 @@
+"""Compact Yummly data models.
+
+These mirror the models in `yummly.models` (same class names, attribute
+names and defaults) but are built on `__slots__` instead of `dict` so each
+object only stores its field values. Use them when holding many model
+objects in memory, e.g. via ``Client(compact=True)``.
+"""
+
+from inspect import getargspec
+
+
+class Record(object):
+    """Compact, `__slots__` based alternative to `models.Storage`.
+
+    Supports `obj.foo` as well as read-only `obj['foo']` access. Unlike
+    `models.Storage`, attributes other than the model's fields can't be set.
+
+    >>> class Point(Record):
+    ...     __slots__ = ('x', 'y')
+    ...     def __init__(self, **kargs):
+    ...         self.x = kargs['x']
+    ...         self.y = kargs.get('y')
+
+    >>> p = Point(x=1)
+
+    >>> assert(p.x == p['x'] == 1)
+    >>> assert(p.y is None)
+    >>> assert(p == Point(x=1, y=None))
+
+    >>> p.to_dict() == {'x': 1, 'y': None}
+    True
+
+    >>> p.z = 1
+    Traceback (most recent call last):
+    ...
+    AttributeError: 'Point' object has no attribute 'z'
+
+    >>> print p['z']
+    Traceback (most recent call last):
+    ...
+    KeyError: 'z'
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _slots(cls):
+        """Return all slot names of class and its bases."""
+        slots = cls.__dict__.get('_all_slots')
+
+        if slots is None:
+            slots = []
+            for klass in reversed(cls.__mro__):
+                slots.extend(klass.__dict__.get('__slots__', ()))
+            cls._all_slots = slots
+
+        return slots
+
+    def __getitem__(self, key):
+        # Only fields are items, not methods or private attributes.
+        if key not in self.keys():
+            raise KeyError(key)
+
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        # Deleted fields aren't contained.
+        return key in self.keys() and hasattr(self, key)
+
+    def __eq__(self, other):
+        # Subclasses (e.g. lazy and eager recipes) compare by their fields.
+        return ((isinstance(other, type(self)) or
+                 isinstance(self, type(other))) and
+                self.to_dict() == other.to_dict())
+
+    def __ne__(self, other):
+        return not self == other
+
+    # Like `models.Storage`, records are mutable and compare by value.
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, self.to_dict())
+
+    def __getstate__(self):
+        return dict(self.items())
+
+    def __setstate__(self, state):
+        for key, value in state.iteritems():
+            setattr(self, key, value)
+
+    def keys(self):
+        """Return list of field names."""
+        return [key for key in self._slots() if key[0] != '_']
+
+    def items(self):
+        """Return list of ``(field, value)`` tuples of fields which are set."""
+        items = []
+
+        for key in self.keys():
+            try:
+                items.append((key, getattr(self, key)))
+            except AttributeError:
+                pass
+
+        return items
+
+    def get(self, key, default=None):
+        """Return field value or `default` if not present."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        """Return model (and nested models) converted to dicts."""
+        return dict((key, _to_dict(value)) for key, value in self.items())
+
+    @classmethod
+    def _get_fields(cls):
+        """Return class' __init__() args excluding `self`."""
+        return getargspec(cls.__init__).args[1:]
+
+
+def _to_dict(value):
+    """Convert `Record` objects contained in `value` to dicts."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    elif isinstance(value, list):
+        return [_to_dict(item) for item in value]
+    else:
+        return value
+
+
+##################################################
+# Get recipe related models
+##################################################
+
+
+class Recipe(Record):
+    """Recipe model."""
+    __slots__ = ('id', 'name', 'rating', 'totalTime', 'totalTimeInSeconds',
+                 'ingredientLines', 'numberOfServings', 'yields',
+                 'attributes', 'source', 'attribution', 'flavors',
+                 'nutritionEstimates', 'images')
+
+    def __init__(self, **kargs):
+        self._set_fields(kargs)
+
+        self.source = self._build_source(kargs)
+        self.attribution = self._build_attribution(kargs)
+        self.flavors = self._build_flavors(kargs)
+        self.nutritionEstimates = self._build_nutritionEstimates(kargs)
+        self.images = self._build_images(kargs)
+
+    def _set_fields(self, kargs):
+        """Set fields other than nested models from `kargs`."""
+        self.id = kargs['id']
+        self.name = kargs['name']
+        self.rating = kargs.get('rating')
+        self.totalTime = kargs.get('totalTime') or 0
+        self.totalTimeInSeconds = kargs.get('totalTimeInSeconds') or 0
+        self.ingredientLines = kargs.get('ingredientLines') or []
+        self.numberOfServings = kargs.get('numberOfServings')
+        self.yields = kargs.get('yields')
+        self.attributes = kargs.get('attributes') or {}
+
+    # See `models.Recipe`.
+
+    @staticmethod
+    def _build_source(kargs):
+        return RecipeSource(**(kargs.get('source') or {}))
+
+    @staticmethod
+    def _build_attribution(kargs):
+        return Attribution(**(kargs.get('attribution') or {}))
+
+    @staticmethod
+    def _build_flavors(kargs):
+        # NOTE: For `flavors`, the keys are returned capitalized so normalize
+        # to lowercase since search results' flavor keys are lowercase.
+        flavors = kargs.get('flavors') or {}
+        return Flavors(**{key.lower(): value
+                          for key, value in flavors.iteritems()})
+
+    @staticmethod
+    def _build_nutritionEstimates(kargs):
+        return [NutritionEstimate(**nute)
+                for nute in (kargs.get('nutritionEstimates') or [])]
+
+    @staticmethod
+    def _build_images(kargs):
+        return [RecipeImages(**imgs) for imgs in (kargs.get('images') or [])]
+
+
+class LazyRecipe(Recipe):
+    """Recipe model which builds its nested models (`source`, `attribution`,
+    `flavors`, `nutritionEstimates` and `images`) from the retained response
+    data on first access instead of on construction.
+    """
+    __slots__ = ('_raw', '_pending')
+
+    _lazy_fields = ('source',
+                    'attribution',
+                    'flavors',
+                    'nutritionEstimates',
+                    'images')
+
+    def __init__(self, **kargs):
+        # Lazy fields not built (or deleted) yet.
+        self._pending = set(self._lazy_fields)
+        self._raw = kargs
+        self._set_fields(kargs)
+
+    def _unbuilt(self):
+        # NOTE: Unpickling sets fields without calling `__init__`.
+        try:
+            return object.__getattribute__(self, '_pending')
+        except AttributeError:
+            return ()
+
+    def __getattr__(self, key):
+        # Only called for slots which haven't been set yet.
+        if key not in self._unbuilt():
+            raise AttributeError(key)
+
+        value = getattr(self, '_build_' + key)(self._raw)
+        setattr(self, key, value)
+
+        return value
+
+    def __setattr__(self, key, value):
+        if key in self._unbuilt():
+            self._pending.discard(key)
+        object.__setattr__(self, key, value)
+
+    def __delattr__(self, key):
+        if key in self._unbuilt():
+            self._pending.discard(key)
+        else:
+            object.__delattr__(self, key)
+
+    def __contains__(self, key):
+        # Don't build lazy fields to check for them.
+        return key in self._unbuilt() or Recipe.__contains__(self, key)
+
+
+class Flavors(Record):
+    """Flavors model."""
+    __slots__ = ('salty', 'meaty', 'piquant', 'bitter', 'sour', 'sweet')
+
+    def __init__(self, **kargs):
+        self.salty = kargs.get('salty')
+        self.meaty = kargs.get('meaty')
+        self.piquant = kargs.get('piquant')
+        self.bitter = kargs.get('bitter')
+        self.sour = kargs.get('sour')
+        self.sweet = kargs.get('sweet')
+
+
+class Attribution(Record):
+    """Attribution model."""
+    __slots__ = ('html', 'url', 'text', 'logo')
+
+    def __init__(self, **kargs):
+        self.html = kargs.get('html')
+        self.url = kargs.get('url')
+        self.text = kargs.get('text')
+        self.logo = kargs.get('logo')
+
+
+class NutritionEstimate(Record):
+    """Nutrition estimate model."""
+    __slots__ = ('attribute', 'description', 'value', 'unit')
+
+    def __init__(self, **kargs):
+        self.attribute = kargs.get('attribute')
+        self.description = kargs.get('description')
+        self.value = kargs.get('value')
+        self.unit = NutritionUnit(**(kargs.get('unit') or {}))
+
+
+class NutritionUnit(Record):
+    """Nutrition unit model."""
+    __slots__ = ('id', 'abbreviation', 'plural', 'pluralAbbreviation')
+
+    def __init__(self, **kargs):
+        self.id = kargs['id']
+        self.abbreviation = kargs.get('abbreviation')
+        self.plural = kargs.get('plural')
+        self.pluralAbbreviation = kargs.get('pluralAbbreviation')
+
+
+class RecipeImages(Record):
+    """Recipe images model."""
+    __slots__ = ('hostedLargeUrl', 'hostedSmallUrl')
+
+    def __init__(self, **kargs):
+        self.hostedLargeUrl = kargs.get('hostedLargeUrl')
+        self.hostedSmallUrl = kargs.get('hostedSmallUrl')
+
+
+class RecipeSource(Record):
+    """Recipe source model."""
+    __slots__ = ('sourceRecipeUrl', 'sourceSiteUrl', 'sourceDisplayName')
+
+    def __init__(self, **kargs):
+        self.sourceRecipeUrl = kargs.get('sourceRecipeUrl')
+        self.sourceSiteUrl = kargs.get('sourceSiteUrl')
+        self.sourceDisplayName = kargs.get('sourceDisplayName')
+
+
+##################################################
+# Search related models
+##################################################
+
+
+class SearchResult(Record):
+    """Search result model."""
+    __slots__ = ('totalMatchCount', 'criteria', 'facetCounts', 'matches',
+                 'attribution')
+
+    def __init__(self, **kargs):
+        self.totalMatchCount = kargs['totalMatchCount']
+        self.criteria = SearchCriteria(**kargs['criteria'])
+        self.facetCounts = kargs['facetCounts']
+        self.matches = [SearchMatch(**match) for match in kargs['matches']]
+        self.attribution = Attribution(**kargs['attribution'])
+
+
+class SearchMatch(Record):
+    """Search match model."""
+    __slots__ = ('id', 'recipeName', 'rating', 'totalTimeInSeconds',
+                 'ingredients', 'flavors', 'smallImageUrls',
+                 'sourceDisplayName', 'attributes')
+
+    def __init__(self, **kargs):
+        self.id = kargs['id']
+        self.recipeName = kargs['recipeName']
+        self.rating = kargs.get('rating')
+        self.totalTimeInSeconds = kargs.get('totalTimeInSeconds', 0)
+        self.ingredients = kargs.get('ingredients')
+        self.flavors = Flavors(**(kargs.get('flavors') or {}))
+        self.smallImageUrls = kargs.get('smallImageUrls')
+        self.sourceDisplayName = kargs.get('sourceDisplayName', '')
+        self.attributes = kargs.get('attributes')
+
+
+class SearchCriteria(Record):
+    """Search criteria model."""
+    __slots__ = ('maxResults', 'resultsToSkip', 'terms', 'requirePictures',
+                 'facetFields', 'allowedIngredients', 'excludedIngredients',
+                 'attributeRanges', 'allowedAttributes', 'excludedAttributes',
+                 'allowedDiets', 'nutritionRestrictions')
+
+    def __init__(self, **kargs):
+        self.maxResults = kargs.get('maxResults')
+        self.resultsToSkip = kargs.get('resultsToSkip')
+        self.terms = kargs.get('terms')
+        self.requirePictures = kargs.get('requirePictures')
+        self.facetFields = kargs.get('facetFields')
+        self.allowedIngredients = kargs.get('allowedIngredients')
+        self.excludedIngredients = kargs.get('excludedIngredients')
+        self.attributeRanges = kargs.get('attributeRanges', {})
+        self.allowedAttributes = kargs.get('allowedAttributes', [])
+        self.excludedAttributes = kargs.get('excludedAttributes', [])
+        self.allowedDiets = kargs.get('allowedDiets', [])
+        self.nutritionRestrictions = kargs.get('nutritionRestrictions', {})
+
+
+##################################################
+# Metadata related models
+##################################################
+
+
+class MetaAttribute(Record):
+    """Base class for metadata attributes."""
+    __slots__ = ('id', 'description', 'localesAvailableIn', 'name',
+                 'searchValue', 'type')
+
+    def __init__(self, **kargs):
+        self.id = kargs['id']
+        self.description = kargs['description']
+        self.localesAvailableIn = kargs['localesAvailableIn']
+        self.name = kargs['name']
+        self.searchValue = kargs['searchValue']
+        self.type = kargs['type']
+
+
+class MetaHoliday(MetaAttribute):
+    """Holiday metadata model."""
+    __slots__ = ()
+
+
+class MetaCuisine(MetaAttribute):
+    """Cuisine metadata model."""
+    __slots__ = ()
+
+
+class MetaCourse(MetaAttribute):
+    """Course metadata model."""
+    __slots__ = ()
+
+
+class MetaTechnique(MetaAttribute):
+    """Technique metadata model."""
+    __slots__ = ()
+
+
+class MetaSource(Record):
+    """Source metadata model."""
+    __slots__ = ('faviconUrl', 'description', 'searchValue')
+
+    def __init__(self, **kargs):
+        self.faviconUrl = kargs['faviconUrl']
+        self.description = kargs['description']
+        self.searchValue = kargs['searchValue']
+
+
+class MetaBrand(Record):
+    """Brand metadata model."""
+    __slots__ = ('faviconUrl', 'description', 'searchValue')
+
+    def __init__(self, **kargs):
+        self.faviconUrl = kargs['faviconUrl']
+        self.description = kargs['description']
+        self.searchValue = kargs['searchValue']
+
+
+class MetaDiet(Record):
+    """Diet metadata model."""
+    __slots__ = ('id', 'localesAvailableIn', 'longDescription',
+                 'searchValue', 'shortDescription', 'type')
+
+    def __init__(self, **kargs):
+        self.id = kargs['id']
+        self.localesAvailableIn = kargs['localesAvailableIn']
+        self.longDescription = kargs['longDescription']
+        self.searchValue = kargs['searchValue']
+        self.shortDescription = kargs['shortDescription']
+        self.type = kargs['type']
+
+
+class MetaAllergy(Record):
+    """Allergy metadata model."""
+    __slots__ = ('id', 'localesAvailableIn', 'longDescription',
+                 'shortDescription', 'searchValue', 'type')
+
+    def __init__(self, **kargs):
+        self.id = kargs['id']
+        self.localesAvailableIn = kargs['localesAvailableIn']
+        self.longDescription = kargs['longDescription']
+        self.shortDescription = kargs['shortDescription']
+        self.searchValue = kargs['searchValue']
+        self.type = kargs['type']
+
+
+class MetaIngredient(Record):
+    """Ingredient metadata model."""
+    __slots__ = ('description', 'term', 'searchValue')
+
+    def __init__(self, **kargs):
+        self.description = kargs['description']
+        self.term = kargs['term']
+        self.searchValue = kargs['searchValue']
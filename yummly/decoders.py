@@ -0,0 +1,138 @@
+"""JSON decoders used to parse Yummly API responses.
+
+`ujson` is used by default when it's installed with the standard library's
+`json` module as a fallback.
+"""
+
+import json
+
+
+class JSONDecoder(object):
+    """Decoder using the standard library's `json` module."""
+    name = 'json'
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+
+    def loads(self, data):
+        """Decode JSON document `data`."""
+        return json.loads(data)
+
+    def loads_slice(self, data, start, end):
+        """Decode JSON document found at `data[start:end]`.
+
+        Decoding starts at `start` in place so that no copy of the slice is
+        made.
+        """
+        value, _ = self._decoder.raw_decode(data, start)
+        return value
+
+
+class UJSONDecoder(JSONDecoder):
+    """Decoder using `ujson`.
+
+    Floats are parsed with ujson's precise parser so that values match those
+    decoded by `json`.
+    """
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson  # pylint: disable=import-error
+        self._loads = ujson.loads
+
+    def loads(self, data):
+        return self._loads(data, precise_float=True)
+
+    def loads_slice(self, data, start, end):
+        return self._loads(data[start:end], precise_float=True)
+
+
+DECODERS = {
+    'json': JSONDecoder,
+    'ujson': UJSONDecoder,
+}
+
+# Order in which decoders are tried when none is specified.
+PREFERRED = ('ujson', 'json')
+
+
+def get_decoder(name=None):
+    """Return decoder instance for `name` (``'json'`` or ``'ujson'``). If
+    `name` is ``None``, the fastest installed decoder is returned.
+
+    >>> get_decoder('json').loads('{"a": [1]}')
+    {u'a': [1]}
+    """
+    if name is not None:
+        return DECODERS[name]()
+
+    for name in PREFERRED:
+        try:
+            return DECODERS[name]()
+        except ImportError:
+            pass
+
+
+# Characters skipped between elements of a streamed JSON array.
+SEPARATORS = ' \t\n\r,'
+
+
+def iter_array(chunks):
+    """Yield elements of the first JSON array found in byte string `chunks`
+    one at a time as soon as they've been received and parsed.
+
+    Only the data of the element being parsed is buffered so memory use
+    doesn't grow with the size of the array.
+
+    >>> list(iter_array(['x([{"a"', ': 1}, 2', ', "b"]);']))
+    [{u'a': 1}, 2, u'b']
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buf = ''
+
+    for chunk in chunks:
+        buf += chunk
+        start = buf.find('[')
+
+        if start != -1:
+            buf = buf[start + 1:]
+            break
+    else:
+        raise ValueError('No JSON array found')
+
+    pos = 0
+
+    while True:
+        while pos < len(buf) and buf[pos] in SEPARATORS:
+            pos += 1
+
+        if pos < len(buf) and buf[pos] == ']':
+            return
+
+        value = end = None
+
+        if pos < len(buf):
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                # Element is incomplete (or malformed).
+                pass
+
+        # A number or literal is only complete once it's followed by a
+        # separator or the end of the array since a chunk boundary may fall
+        # anywhere inside it (e.g. right after the "." of "1.5").
+        if end is None or (buf[pos] not in '{["' and
+                           (end == len(buf) or
+                            buf[end] not in SEPARATORS + ']')):
+            chunk = next(chunks, None)
+
+            if chunk is None:
+                raise ValueError('Unterminated JSON array')
+
+            buf = buf[pos:] + chunk
+            pos = 0
+            continue
+
+        yield value
+        pos = end
@@ -0,0 +1,60 @@
+"""Shared value tables which deduplicate values repeated across metadata
+items.
+
+Decoding a metadata response allocates a separate copy of every value, even
+though fields like `type` and `localesAvailableIn` hold the same few values
+for thousands of items. A `ValueTable` maps each such value to a single
+canonical copy so items share it instead.
+"""
+
+
+# Metadata fields whose values are repeated across items of a category.
+SHARED_FIELDS = ('type', 'localesAvailableIn')
+
+
+class ValueTable(object):
+    """Table of canonical copies of repeated metadata values.
+
+    Lists are converted to tuples (with shared items) so that the shared
+    copies are hashable and can't be modified through any one item.
+
+    >>> table = ValueTable()
+    >>> a = table.compact({'type': u'diet', 'localesAvailableIn': [u'en-US']})
+    >>> b = table.compact({'type': u'diet', 'localesAvailableIn': [u'en-US']})
+    >>> a['localesAvailableIn']
+    (u'en-US',)
+    >>> a['localesAvailableIn'] is b['localesAvailableIn']
+    True
+
+    :param fields: names of metadata fields whose values are shared
+    """
+
+    def __init__(self, fields=SHARED_FIELDS):
+        self.fields = tuple(fields)
+        self._values = {}
+
+    def __len__(self):
+        return len(self._values)
+
+    def share(self, value):
+        """Return canonical copy of `value`."""
+        if isinstance(value, list):
+            value = tuple([self.share(item) for item in value])
+
+        return self._values.setdefault(value, value)
+
+    def compact(self, data):
+        """Return copy of metadata item `data` with values of shared fields
+        replaced by their canonical copies.
+        """
+        data = dict(data)
+
+        for field in self.fields:
+            if field in data:
+                data[field] = self.share(data[field])
+
+        return data
+
+    def clear(self):
+        """Remove all values from table."""
+        self._values.clear()
@@ -0,0 +1,75 @@
+"""Tracking of recent request latencies.
+"""
+
+from bisect import bisect_left, insort
+from collections import deque
+import math
+from threading import Lock
+
+
+# Default number of most recent latencies tracked.
+WINDOW = 1000
+
+# Default min number of latencies recorded before percentiles are reported.
+MIN_SAMPLES = 20
+
+
+class LatencyHistogram(object):
+    """Thread-safe distribution of the most recent `size` latencies.
+
+    Latencies are kept sorted so percentiles are looked up in constant time.
+
+    >>> latencies = LatencyHistogram(min_samples=1)
+    >>> for seconds in (0.3, 0.1, 0.2, 0.4):
+    ...     latencies.record(seconds)
+    >>> latencies.percentile(50)
+    0.2
+
+    :param size: number of most recent latencies tracked
+    :param min_samples: min number of latencies recorded before
+        `percentile` returns a value
+    """
+
+    def __init__(self, size=WINDOW, min_samples=MIN_SAMPLES):
+        assert(size > 0)
+        self.size = size
+        self.min_samples = min_samples
+
+        self._recent = deque()
+        self._sorted = []
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._recent)
+
+    def record(self, seconds):
+        """Record a latency of `seconds`, dropping the oldest one if the
+        window is full.
+        """
+        with self._lock:
+            if len(self._recent) == self.size:
+                oldest = self._recent.popleft()
+                del self._sorted[bisect_left(self._sorted, oldest)]
+
+            self._recent.append(seconds)
+            insort(self._sorted, seconds)
+
+    def percentile(self, percent):
+        """Return latency at `percent` (0-100) percentile (nearest rank) or
+        ``None`` if fewer than `min_samples` latencies were recorded.
+        """
+        with self._lock:
+            count = len(self._sorted)
+
+            if not count or count < self.min_samples:
+                return None
+
+            rank = int(math.ceil(percent / 100.0 * count))
+
+            return self._sorted[min(max(rank, 1), count) - 1]
+
+    def clear(self):
+        """Remove all recorded latencies."""
+        with self._lock:
+            self._recent.clear()
+            del self._sorted[:]
@@ -76,6 +76,16 @@ class Storage(dict):
 class Recipe(Storage):
     """Recipe model."""
     def __init__(self, **kargs):
+        self._set_fields(kargs)
+
+        self.source = self._build_source(kargs)
+        self.attribution = self._build_attribution(kargs)
+        self.flavors = self._build_flavors(kargs)
+        self.nutritionEstimates = self._build_nutritionEstimates(kargs)
+        self.images = self._build_images(kargs)
+
+    def _set_fields(self, kargs):
+        """Set fields other than nested models from `kargs`."""
         self.id = kargs['id']
         self.name = kargs['name']
         self.rating = kargs.get('rating')
@@ -86,21 +96,183 @@ class Recipe(Storage):
         self.yields = kargs.get('yields')
         self.attributes = kargs.get('attributes') or {}
 
-        self.source = RecipeSource(**(kargs.get('source') or {}))
-        self.attribution = Attribution(**(kargs.get('attribution') or {}))
+    # Nested models are built by these methods so that `LazyRecipe` can build
+    # them on demand in the same way. `compact.Recipe` follows the same
+    # layout.
+
+    @staticmethod
+    def _build_source(kargs):
+        return RecipeSource(**(kargs.get('source') or {}))
+
+    @staticmethod
+    def _build_attribution(kargs):
+        return Attribution(**(kargs.get('attribution') or {}))
 
+    @staticmethod
+    def _build_flavors(kargs):
         # NOTE: For `flavors`, the keys are returned capitalized so normalize
         # to lowercase since search results' flavor keys are lowercase.
         flavors = kargs.get('flavors') or {}
-        self.flavors = Flavors(**{key.lower(): value
-                                  for key, value in flavors.iteritems()})
+        return Flavors(**{key.lower(): value
+                          for key, value in flavors.iteritems()})
+
+    @staticmethod
+    def _build_nutritionEstimates(kargs):
+        return [NutritionEstimate(**nute)
+                for nute in (kargs.get('nutritionEstimates') or [])]
+
+    @staticmethod
+    def _build_images(kargs):
+        return [RecipeImages(**imgs) for imgs in (kargs.get('images') or [])]
+
+
+class LazyRecipe(Recipe):
+    """Recipe model which builds its nested models (`source`, `attribution`,
+    `flavors`, `nutritionEstimates` and `images`) from the retained response
+    data on first access instead of on construction.
+
+    It behaves the same as `Recipe` except when its underlying `dict` is
+    read directly, bypassing the lazy lookups: `dict(recipe)`,
+    ``func(**recipe)`` and ``other.update(recipe)`` miss the nested models
+    which haven't been built yet. Use `recipe.copy()` for these instead.
+    """
+    _lazy_fields = ('source',
+                    'attribution',
+                    'flavors',
+                    'nutritionEstimates',
+                    'images')
+
+    def __init__(self, **kargs):
+        # Store data and lazy fields not built (or deleted) yet as instance
+        # attributes instead of dict items.
+        self.__dict__['_raw'] = kargs
+        self.__dict__['_pending'] = set(self._lazy_fields)
+
+        self._set_fields(kargs)
+
+    def _unbuilt(self):
+        # NOTE: Unpickling may set items before instance attributes.
+        return self.__dict__.get('_pending', ())
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key)
+
+    def __getitem__(self, key):
+        if key in self._unbuilt():
+            self._hydrate(key)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        if key in self._unbuilt():
+            self._pending.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if key in self._unbuilt():
+            self._pending.discard(key)
+        else:
+            dict.__delitem__(self, key)
+
+    def __contains__(self, key):
+        return key in self._unbuilt() or dict.__contains__(self, key)
+
+    def __len__(self):
+        # Count lazy fields without building them.
+        return dict.__len__(self) + len(self._unbuilt())
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def has_key(self, key):
+        return key in self
 
-        self.nutritionEstimates = [NutritionEstimate(**nute)
-                                   for nute in (kargs.get('nutritionEstimates')
-                                                or [])]
+    def pop(self, key, *default):
+        if key in self._unbuilt():
+            self._hydrate(key)
+        return dict.pop(self, key, *default)
 
-        self.images = [RecipeImages(**imgs)
-                       for imgs in (kargs.get('images') or [])]
+    def setdefault(self, key, default=None):
+        if key in self._unbuilt():
+            self._hydrate(key)
+        return dict.setdefault(self, key, default)
+
+    def __repr__(self):
+        self._hydrate()
+        return super(LazyRecipe, self).__repr__()
+
+    # The following `dict` methods see all fields, so build them first.
+
+    def __iter__(self):
+        self._hydrate()
+        return dict.__iter__(self)
+
+    def __eq__(self, other):
+        self._hydrate()
+        if isinstance(other, LazyRecipe):
+            other._hydrate()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        self._hydrate()
+        return dict.__reduce__(self)
+
+    def __reduce_ex__(self, protocol):
+        self._hydrate()
+        return dict.__reduce_ex__(self, protocol)
+
+    def keys(self):
+        self._hydrate()
+        return dict.keys(self)
+
+    def values(self):
+        self._hydrate()
+        return dict.values(self)
+
+    def items(self):
+        self._hydrate()
+        return dict.items(self)
+
+    def iterkeys(self):
+        self._hydrate()
+        return dict.iterkeys(self)
+
+    def itervalues(self):
+        self._hydrate()
+        return dict.itervalues(self)
+
+    def iteritems(self):
+        self._hydrate()
+        return dict.iteritems(self)
+
+    def copy(self):
+        self._hydrate()
+        return dict.copy(self)
+
+    def popitem(self):
+        self._hydrate()
+        return dict.popitem(self)
+
+    def update(self, *args, **kargs):
+        self._hydrate()
+        dict.update(self, *args, **kargs)
+
+    def _hydrate(self, *keys):
+        """Build nested models for `keys` (or all if none given) unless
+        they've been built or deleted already.
+        """
+        pending = self._unbuilt()
+
+        for key in (keys or self._lazy_fields):
+            if key in pending:
+                pending.discard(key)
+                build = getattr(self, '_build_' + key)
+                dict.__setitem__(self, key, build(self._raw))
 
 
 class Flavors(Storage):
@@ -156,6 +328,13 @@ class RecipeSource(Storage):
         self.sourceDisplayName = kargs.get('sourceDisplayName')
 
 
+class RecipeBatch(Storage):
+    """Bulk recipe fetch result model."""
+    def __init__(self, **kargs):
+        self.recipes = kargs.get('recipes') or []
+        self.errors = kargs.get('errors') or {}
+
+
 ##################################################
 # Search related models
 ##################################################
@@ -171,6 +350,16 @@ class SearchResult(Storage):
         self.attribution = Attribution(**kargs['attribution'])
 
 
+class MultiSearchResult(Storage):
+    """Merged result model of multiple searches."""
+    def __init__(self, **kargs):
+        self.totalMatchCount = kargs.get('totalMatchCount', 0)
+        self.facetCounts = kargs.get('facetCounts') or {}
+        self.matches = kargs.get('matches') or []
+        self.errors = kargs.get('errors') or {}
+        self.sources = kargs.get('sources') or {}
+
+
 class SearchMatch(Storage):
     """Search match model."""
     def __init__(self, **kargs):
@@ -0,0 +1,137 @@
+"""Client-side rate limiting of Yummly API requests.
+
+`TokenBucket` limits requests of all threads of a process while
+`FileTokenBucket` keeps its state in a locked file so that all processes on a
+host using the same file share one quota.
+"""
+
+import os
+from threading import Lock
+from time import sleep, time
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket rate limiter.
+
+    The bucket holds up to `burst` tokens and is refilled with `rate` tokens
+    per second. Each request takes a token, waiting for one to be refilled if
+    the bucket is empty.
+
+    :param rate: max sustained requests per second
+    :param burst: max number of requests made at once after being idle.
+        Defaults to `rate` (but at least ``1``).
+    :param timer: function returning the current time in seconds
+    :param sleep: function sleeping for given seconds
+    """
+
+    def __init__(self, rate, burst=None, timer=time, sleep=sleep):
+        assert(rate > 0)
+        self.rate = float(rate)
+
+        if burst is None:
+            burst = max(1, int(rate))
+
+        assert(burst >= 1)
+        self.burst = burst
+
+        self.timer = timer
+        self.sleep = sleep
+
+        self._lock = Lock()
+        self._state = (float(burst), timer())
+
+    def acquire(self, tokens=1):
+        """Take `tokens` from the bucket, waiting until they are available.
+
+        :returns: total seconds waited
+        """
+        assert(0 < tokens <= self.burst)
+        waited = 0.0
+
+        while True:
+            delay = self.try_acquire(tokens)
+
+            if not delay:
+                return waited
+
+            self.sleep(delay)
+            waited += delay
+
+    def try_acquire(self, tokens=1):
+        """Take `tokens` from the bucket if available without waiting.
+
+        :returns: ``0`` if the tokens were taken, otherwise the seconds until
+            they will be available
+        """
+        with self._lock:
+            self._state, delay = self._take(self._state, tokens)
+
+        return delay
+
+    def _take(self, state, tokens):
+        """Return new ``(available, updated)`` bucket `state` after trying to
+        take `tokens` and seconds to wait for them (``0`` if taken).
+        """
+        available, updated = state
+        now = self.timer()
+
+        # Guard against the clock going backwards.
+        elapsed = max(0.0, now - updated)
+        available = min(self.burst, available + elapsed * self.rate)
+
+        if available >= tokens:
+            return (available - tokens, now), 0
+
+        return (available, now), (tokens - available) / self.rate
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket whose state is kept in a file locked while it's updated
+    so that all processes using the same `path` share one quota.
+
+    Requires `fcntl` (i.e. a POSIX system).
+
+    :param path: path of state file. Created if it doesn't exist.
+    """
+
+    def __init__(self, path, rate, burst=None, timer=time, sleep=sleep):
+        import fcntl
+        self._fcntl = fcntl
+
+        super(FileTokenBucket, self).__init__(rate,
+                                              burst=burst,
+                                              timer=timer,
+                                              sleep=sleep)
+        self.path = path
+
+    def try_acquire(self, tokens=1):
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+            try:
+                self._fcntl.flock(fd, self._fcntl.LOCK_EX)
+                state = self._read_state(fd)
+                state, delay = self._take(state, tokens)
+                self._write_state(fd, state)
+            finally:
+                # Closing the file releases its lock.
+                os.close(fd)
+
+        return delay
+
+    def _read_state(self, fd):
+        """Return bucket state stored in `fd`, or a full bucket if the file
+        is new or invalid.
+        """
+        try:
+            data = os.read(fd, 64)
+            available, updated = data.split()
+            return float(available), float(updated)
+        except (ValueError, OSError):
+            return float(self.burst), self.timer()
+
+    def _write_state(self, fd, state):
+        """Replace bucket state stored in `fd` with `state`."""
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, '{0!r} {1!r}'.format(*state))
@@ -0,0 +1,196 @@
+"""Indexed, auto-refreshing store of Yummly metadata.
+"""
+
+from threading import Event, Lock, Thread
+from time import time
+
+from client import extracting_metadata, YummlyError
+
+
+# Fields used to index metadata by name, in order of preference.
+NAME_FIELDS = ('term', 'name', 'shortDescription', 'description')
+
+
+class MetadataCategory(object):
+    """Metadata items of a single category indexed by `searchValue`, `id` and
+    name (case-insensitive).
+
+    :param key: metadata category key
+    :param items: list of `Meta*` model objects
+    :param etag: ETag of response the items were loaded from
+    :param last_modified: Last-Modified of response the items were loaded
+        from
+    """
+
+    def __init__(self, key, items, etag=None, last_modified=None):
+        self.key = key
+        self.items = items
+        self.etag = etag
+        self.last_modified = last_modified
+        self.checked = time()
+
+        self.by_search_value = {}
+        self.by_id = {}
+        self.by_name = {}
+
+        for item in items:
+            self.by_search_value[item.searchValue] = item
+
+            if 'id' in item:
+                self.by_id[item.id] = item
+
+            for field in NAME_FIELDS:
+                if field in item:
+                    self.by_name[item[field].lower()] = item
+                    break
+
+
+class MetadataRegistry(object):
+    """Registry which loads each metadata category once and indexes it for
+    constant time lookups.
+
+    Categories are loaded on first use. Refreshing a category revalidates it
+    with a conditional request so unchanged metadata isn't downloaded and
+    parsed again.
+
+    :param client: `Client` used to fetch metadata
+    :param keys: metadata keys to manage (defaults to `Client.METADATA`)
+    :param refresh_interval: seconds between background refreshes. If
+        ``None``, categories are only refreshed by calling `refresh`.
+    """
+
+    def __init__(self, client, keys=None, refresh_interval=None):
+        self.client = client
+        self.keys = list(keys or client.METADATA)
+
+        for key in self.keys:
+            # Raises `YummlyError` for invalid keys.
+            client._metadata_class(key)
+
+        self.refresh_interval = refresh_interval
+        self.last_error = None
+
+        self._categories = {}
+        self._lock = Lock()
+        self._stop = Event()
+        self._refresher = None
+
+        if refresh_interval:
+            self.start()
+
+    def __contains__(self, key):
+        return key in self._categories
+
+    def category(self, key):
+        """Return `MetadataCategory` for `key`, loading it if needed."""
+        category = self._categories.get(key)
+
+        if category is None:
+            with self._lock:
+                category = self._categories.get(key)
+
+                if category is None:
+                    category = self.load(key)
+
+        return category
+
+    def load(self, key):
+        """Fetch metadata for `key` and index it. If the category is already
+        loaded, the request is conditional on it having changed.
+        """
+        if key not in self.keys:
+            raise YummlyError('Metadata key not managed by registry: ' + key)
+
+        current = self._categories.get(key)
+        headers = {}
+
+        if current is not None:
+            if current.etag:
+                headers['If-None-Match'] = current.etag
+            if current.last_modified:
+                headers['If-Modified-Since'] = current.last_modified
+
+        url = '{0}/{1}'.format(self.client.URL_META, key)
+        response = self.client._request(url, headers=headers)
+
+        if current is not None and response.status_code == 304:
+            current.checked = time()
+            return current
+
+        MetaClass = self.client._metadata_class(key)
+
+        with extracting_metadata():
+            items = [self.client._metadata_item(MetaClass, md)
+                     for md in self.client._extract_metadata(response)]
+
+        category = MetadataCategory(
+            key,
+            items,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'))
+
+        # Replace whole category at once so readers never see partial data.
+        self._categories[key] = category
+
+        return category
+
+    def refresh(self):
+        """Revalidate all loaded categories."""
+        for key in list(self._categories):
+            self.load(key)
+
+    def start(self):
+        """Start refreshing categories in a background thread."""
+        assert(self.refresh_interval > 0)
+
+        if self._refresher is not None:
+            return
+
+        self._stop.clear()
+        self._refresher = Thread(target=self._refresh_loop)
+        self._refresher.daemon = True
+        self._refresher.start()
+
+    def stop(self):
+        """Stop background refreshes."""
+        self._stop.set()
+
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as exc:
+                # Keep serving current data until the next refresh.
+                self.last_error = exc
+            else:
+                self.last_error = None
+
+    def all(self, key):
+        """Return list of metadata objects for `key`."""
+        return self.category(key).items
+
+    def by_search_value(self, key, search_value, default=None):
+        """Return metadata object for `key` with given `searchValue`."""
+        return self.category(key).by_search_value.get(search_value, default)
+
+    def by_id(self, key, id, default=None):
+        """Return metadata object for `key` with given `id`."""
+        return self.category(key).by_id.get(id, default)
+
+    def by_name(self, key, name, default=None):
+        """Return metadata object for `key` with given (case-insensitive)
+        name. The name is the `term` for ingredients, the `name` for
+        attributes (e.g. cuisines), the `shortDescription` for diets and
+        allergies and the `description` for sources and brands.
+        """
+        return self.category(key).by_name.get(name.lower(), default)
+
+    def is_valid(self, key, search_value):
+        """Return whether `search_value` is a valid value for `key`, e.g. for
+        validating ``allowedIngredient[]`` or ``allowedCuisine[]`` params.
+        """
+        return search_value in self.category(key).by_search_value
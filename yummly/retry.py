@@ -0,0 +1,135 @@
+"""Retry policy with exponential backoff for failed Yummly API requests.
+"""
+
+from email.utils import mktime_tz, parsedate_tz
+import random
+import time
+
+from requests.exceptions import ConnectionError, Timeout
+
+
+# Base delay in seconds before the first retry. Doubles with every retry.
+BACKOFF = 0.5
+
+# Max delay in seconds between two attempts.
+MAX_BACKOFF = 30.0
+
+# Max total seconds spent retrying a single request. `None` means no limit.
+MAX_RETRY_TIME = 60.0
+
+# Response statuses which are retried: rate limits (Yummly responds with 409
+# when the API rate limit is exceeded) and server errors.
+RETRY_STATUSES = frozenset([409, 429] + range(500, 600))
+
+# Request errors which are retried.
+RETRY_ERRORS = (ConnectionError, Timeout)
+
+
+class RetryPolicy(object):
+    """Policy deciding whether and when a failed request is retried.
+
+    Delays grow exponentially from `backoff` up to `max_backoff`. With
+    `jitter`, the actual delay is chosen uniformly between ``0`` and the
+    exponential delay ("full jitter") so that clients which failed together
+    don't retry together. If a response has a `Retry-After` header, it's
+    used as the delay instead.
+
+    :param backoff: base delay in seconds
+    :param max_backoff: max delay in seconds between two attempts
+    :param max_time: max total seconds spent on a request before giving up.
+        If ``None``, only the client's `retries` limit applies.
+    :param statuses: set of response statuses which are retried
+    :param errors: tuple of request exception classes which are retried
+    :param jitter: whether to randomise delays
+    :param retry_after: whether to honour `Retry-After` response headers
+    :param timer: function returning the current time in seconds
+    :param sleep: function sleeping for given seconds
+    """
+
+    def __init__(self,
+                 backoff=BACKOFF,
+                 max_backoff=MAX_BACKOFF,
+                 max_time=MAX_RETRY_TIME,
+                 statuses=RETRY_STATUSES,
+                 errors=RETRY_ERRORS,
+                 jitter=True,
+                 retry_after=True,
+                 timer=time.time,
+                 sleep=time.sleep):
+        assert(backoff >= 0)
+        self.backoff = backoff
+
+        assert(max_backoff >= backoff)
+        self.max_backoff = max_backoff
+
+        assert(max_time is None or max_time >= 0)
+        self.max_time = max_time
+
+        self.statuses = frozenset(statuses)
+        self.errors = tuple(errors)
+        self.jitter = jitter
+        self.retry_after = retry_after
+        self.timer = timer
+        self.sleep = sleep
+
+    def is_retryable_status(self, status):
+        """Return whether a response with `status` should be retried."""
+        return status in self.statuses
+
+    def is_retryable_error(self, error):
+        """Return whether request exception `error` should be retried."""
+        return isinstance(error, self.errors)
+
+    def delay(self, attempt, started, response=None):
+        """Return seconds to wait before retrying failed `attempt` (counting
+        from ``0``) or ``None`` if the max retry time would be exceeded.
+
+        :param attempt: number of the failed attempt
+        :param started: time at which the first attempt was made
+        :param response: failed response, if any
+        """
+        delay = None
+
+        if self.retry_after and response is not None:
+            delay = parse_retry_after(response.headers.get('Retry-After'),
+                                      now=self.timer())
+
+        if delay is None:
+            delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+
+            if self.jitter:
+                delay = random.uniform(0, delay)
+
+        if (self.max_time is not None and
+                self.timer() - started + delay > self.max_time):
+            return None
+
+        return delay
+
+
+def parse_retry_after(value, now=None):
+    """Return seconds to wait given by `Retry-After` header `value` (either
+    seconds or an HTTP date) or ``None`` if `value` is missing or invalid.
+
+    >>> parse_retry_after('120')
+    120.0
+    >>> parse_retry_after('Wed, 21 Oct 2015 07:28:10 GMT', now=1445412480)
+    10.0
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+
+    if value.isdigit():
+        return float(value)
+
+    date = parsedate_tz(value)
+
+    if date is None:
+        return None
+
+    if now is None:
+        now = time.time()
+
+    return max(0.0, float(mktime_tz(date) - now))
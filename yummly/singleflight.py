@@ -0,0 +1,63 @@
+"""Coalescing of concurrent identical calls into a single call.
+"""
+
+import sys
+from threading import Event, Lock
+
+
+class _Call(object):
+    """In-flight call whose outcome is shared by all its callers."""
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.exc_info = None
+
+
+class SingleFlight(object):
+    """Group of calls deduplicated by key.
+
+    While a call for a key is in flight, further calls for the same key
+    don't call their function but wait for the in-flight call and share its
+    result (or exception). The result isn't copied, so all callers receive
+    the same object.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def do(self, key, func, *args, **kargs):
+        """Return ``func(*args, **kargs)`` unless a call for `key` is already
+        in flight, in which case wait for and return its result instead.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = func(*args, **kargs)
+            except Exception:
+                call.exc_info = sys.exc_info()
+            finally:
+                with self._lock:
+                    del self._calls[key]
+
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.exc_info is not None:
+            raise call.exc_info[0], call.exc_info[1], call.exc_info[2]
+
+        return call.result
@@ -0,0 +1,123 @@
+"""Instrumentation of client requests.
+"""
+
+from collections import defaultdict
+from threading import Lock
+
+from latency import LatencyHistogram
+
+
+# Latency percentiles reported by `ClientStats.snapshot`.
+PERCENTILES = (50, 95, 99)
+
+
+class EndpointStats(object):
+    """Counters and timings of a single endpoint.
+
+    :param window: number of most recent latencies tracked
+    """
+
+    def __init__(self, window):
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.errors = 0
+        self.bytes = 0
+        self.statuses = defaultdict(int)
+        self.latency = LatencyHistogram(size=window, min_samples=1)
+        self.request_time = 0.0
+        self.decode_time = 0.0
+        self.build_time = 0.0
+
+    def snapshot(self, percentiles=PERCENTILES):
+        """Return counters and timings as a `dict`."""
+        return {
+            'calls': self.calls,
+            'attempts': self.attempts,
+            'retries': self.retries,
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'statuses': dict(self.statuses),
+            'latency': dict(('p{0}'.format(percent),
+                             self.latency.percentile(percent))
+                            for percent in percentiles),
+            'request_time': self.request_time,
+            'decode_time': self.decode_time,
+            'build_time': self.build_time,
+        }
+
+
+class ClientStats(object):
+    """Thread-safe per-endpoint request statistics recorded by a client
+    created with ``Client(stats=ClientStats())``.
+
+    For each endpoint (``'recipe'``, ``'search'``, ``'metadata'``), the
+    number of API calls, attempts, retries, errors (calls without a
+    successful response), response bytes and status codes are counted.
+    Latencies of calls (retries included) are kept in a rolling
+    `LatencyHistogram`. Time spent on requests, decoding responses and
+    building models is summed separately.
+
+    To forward measurements to a metrics system as they are made, override
+    `record_call` and `record_time`. Otherwise, export `snapshot` regularly.
+
+    :param window: number of most recent latencies tracked per endpoint
+    """
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._endpoints = {}
+        self._lock = Lock()
+
+    def endpoint(self, endpoint):
+        """Return `EndpointStats` of `endpoint`."""
+        stats = self._endpoints.get(endpoint)
+
+        if stats is None:
+            with self._lock:
+                stats = self._endpoints.setdefault(
+                    endpoint, EndpointStats(self.window))
+
+        return stats
+
+    def record_call(self, endpoint, context):
+        """Record API call to `endpoint` described by `CallContext`
+        `context`.
+        """
+        stats = self.endpoint(endpoint)
+        stats.latency.record(context.elapsed)
+
+        with self._lock:
+            stats.calls += 1
+            stats.attempts += context.attempts
+            stats.retries += context.retries
+            stats.bytes += context.bytes
+            stats.request_time += context.elapsed
+
+            if context.status is None or context.status >= 400:
+                stats.errors += 1
+            if context.status is not None:
+                stats.statuses[context.status] += 1
+
+    def record_time(self, endpoint, phase, seconds):
+        """Record `seconds` spent in `phase` (``'decode'`` or ``'build'``) of
+        a call to `endpoint`.
+        """
+        stats = self.endpoint(endpoint)
+        attr = phase + '_time'
+
+        with self._lock:
+            setattr(stats, attr, getattr(stats, attr) + seconds)
+
+    def snapshot(self, percentiles=PERCENTILES):
+        """Return `dict` of endpoint names mapped to their counters and
+        timings, e.g. for exporting to a metrics system.
+        """
+        with self._lock:
+            return dict((endpoint, stats.snapshot(percentiles))
+                        for endpoint, stats in self._endpoints.iteritems())
+
+    def reset(self):
+        """Remove all recorded statistics."""
+        with self._lock:
+            self._endpoints.clear()
@@ -0,0 +1,196 @@
+"""Transport adapters which record API responses to a JSONL fixture file and
+replay them without network access.
+
+Both are `requests` transport adapters and plug into a client with
+``Client(adapter=...)``::
+
+    # record responses of live API
+    client = Client(api_id, api_key, adapter=RecordingAdapter('api.jsonl'))
+
+    # serve recorded responses
+    client = Client(adapter=ReplayAdapter('api.jsonl', latency=0.2))
+
+Each line of a fixture file is a JSON object with the request's `method` and
+`url` and the response's `status`, `headers` and `body`. Credentials are sent
+as headers so they're never recorded.
+"""
+
+import json
+import random
+from threading import Lock
+import time
+from urllib import urlencode
+from urlparse import parse_qsl, urlsplit, urlunsplit
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.exceptions import ConnectionError, ReadTimeout
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+
+# Response headers kept in fixtures.
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After')
+
+
+def fixture_key(method, url):
+    """Return key matching requests for `url` regardless of the order of its
+    query params.
+
+    >>> fixture_key('GET', 'http://a/b?y=2&x=1')
+    'GET http://a/b?x=1&y=2'
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    return '{0} {1}'.format(method.upper(), urlunsplit(
+        (parts.scheme, parts.netloc, parts.path, query, parts.fragment)))
+
+
+class RecordingAdapter(BaseAdapter):
+    """Adapter which sends requests with `adapter` and appends every
+    request/response pair to JSONL fixture file `path`.
+
+    :param path: path of fixture file
+    :param adapter: adapter sending requests (defaults to a new
+        `requests.adapters.HTTPAdapter`)
+    """
+
+    def __init__(self, path, adapter=None):
+        super(RecordingAdapter, self).__init__()
+        self.path = path
+        self.adapter = adapter or HTTPAdapter()
+        self._lock = Lock()
+
+    def send(self, request, **kargs):
+        response = self.adapter.send(request, **kargs)
+
+        record = {
+            'method': request.method,
+            'url': request.url,
+            'status': response.status_code,
+            'headers': dict((name, response.headers[name])
+                            for name in RECORDED_HEADERS
+                            if name in response.headers),
+            # NOTE: Reading content of streamed responses buffers them.
+            # They're still iterable afterwards.
+            'body': response.content.decode('utf-8'),
+        }
+
+        with self._lock:
+            with open(self.path, 'a') as fileobj:
+                fileobj.write(json.dumps(record, sort_keys=True) + '\n')
+
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Adapter which serves responses recorded in JSONL fixture file `path`.
+
+    If a request was recorded several times, its responses are served in
+    turn. Requests which weren't recorded fail with a `ConnectionError`.
+
+    :param path: path of fixture file
+    :param latency: seconds each response is delayed by, or a callable
+        taking the request and returning the delay. If the delay reaches
+        the request's timeout, a `ReadTimeout` is raised instead.
+    :param error_rate: probability (0-1) of a request failing
+    :param error_status: status code of injected error responses
+    :param error_exception: exception instance raised by failing requests
+        instead of returning an error response
+    :param seed: seed of random number generator deciding which requests
+        fail, for reproducible runs
+    """
+
+    def __init__(self,
+                 path,
+                 latency=0,
+                 error_rate=0,
+                 error_status=503,
+                 error_exception=None,
+                 seed=None):
+        super(ReplayAdapter, self).__init__()
+        self.path = path
+        self.latency = latency
+
+        assert(0 <= error_rate <= 1)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.error_exception = error_exception
+
+        self.requests = []
+        self._random = random.Random(seed)
+        self._responses = {}
+        self._served = {}
+        self._lock = Lock()
+
+        with open(path) as fileobj:
+            for line in fileobj:
+                if line.strip():
+                    record = json.loads(line)
+                    key = fixture_key(record['method'], record['url'])
+                    self._responses.setdefault(key, []).append(record)
+
+    def __len__(self):
+        return sum(len(records) for records in self._responses.itervalues())
+
+    def send(self, request, timeout=None, **kargs):
+        key = fixture_key(request.method, request.url)
+
+        with self._lock:
+            self.requests.append(request)
+            records = self._responses.get(key)
+
+            if records:
+                index = self._served.get(key, 0)
+                self._served[key] = index + 1
+                record = records[index % len(records)]
+
+            failed = self._random.random() < self.error_rate
+
+        if callable(self.latency):
+            delay = self.latency(request)
+        else:
+            delay = self.latency
+
+        if isinstance(timeout, tuple):
+            timeout = timeout[1]
+
+        if timeout is not None and delay and delay >= timeout:
+            time.sleep(timeout)
+            raise ReadTimeout('Replayed response timed out', request=request)
+
+        if delay:
+            time.sleep(delay)
+
+        if not records:
+            raise ConnectionError('No recorded response for ' + key,
+                                  request=request)
+
+        if failed:
+            if self.error_exception is not None:
+                # pylint can't see past the None default here.
+                raise self.error_exception  # pylint: disable=raising-bad-type
+
+            record = {'status': self.error_status, 'headers': {}, 'body': ''}
+
+        return self.build_response(request, record)
+
+    def build_response(self, request, record):
+        """Return `requests.Response` for fixture `record`."""
+        response = Response()
+        response.status_code = record['status']
+        response.headers = CaseInsensitiveDict(record['headers'])
+        response._content = record['body'].encode('utf-8')
+        response._content_consumed = True
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.reason = ''
+
+        return response
+
+    def close(self):
+        pass